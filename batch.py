@@ -0,0 +1,237 @@
+"""
+Vectorized evaluation and move generation over many positions at once with NumPy.
+
+    import numpy as np
+    from batch import evaluate_batch
+    boards = np.array([board.cells for board in positions])  # (N, 14), FastMancalaBoard layout
+    scores = evaluate_batch(boards, sides=2, heuristic="H2")
+
+Scores are from the point of view of `sides` (Game.playerSide[1], the computer)
+and are bit-identical to Game.evaluate_H1 / Game.evaluate_H2 on the same
+positions: every floating-point operation is done in the same order.
+
+BatchBoard plays N games side by side (self-play data generation):
+
+    games = BatchBoard(100_000)
+    rng = np.random.default_rng(0)
+    while not games.game_over().all():
+        games.do_moves(games.random_moves(rng))
+"""
+from typing import List, Optional
+
+import numpy as np
+
+from mancala import (
+    FastMancalaBoard, LANDING, OPPOSITE_INDEX, PIT_INDICES, SOW_CYCLE, SOW_CYCLE_LEN, SOW_PATH, STORE_INDEX,
+)
+
+
+def _landing_table(side: int) -> np.ndarray:
+    """LANDING[side] as a (14, 13) array; rows of cells that are not side's pits are unused."""
+    table = np.zeros((14, SOW_CYCLE_LEN), dtype=np.intp)
+    for i in PIT_INDICES[side]:
+        table[i] = LANDING[side][i]
+    return table
+
+
+_PITS = (None,) + tuple(np.array(PIT_INDICES[side], dtype=np.intp) for side in (1, 2))
+_LANDING = (None, _landing_table(1), _landing_table(2))
+_OWN_PIT = (None,) + tuple(np.isin(np.arange(14), PIT_INDICES[side]) for side in (1, 2))
+_OPPOSITE = np.array(OPPOSITE_INDEX, dtype=np.intp)
+
+# the same tables indexed by side first, for games whose side to move differs
+_LANDING_BY_SIDE = np.stack([np.zeros_like(_LANDING[1]), _LANDING[1], _LANDING[2]])
+_OWN_PIT_BY_SIDE = np.stack([np.zeros(14, dtype=bool), _OWN_PIT[1], _OWN_PIT[2]])
+_STORE = np.array((0, STORE_INDEX[1], STORE_INDEX[2]), dtype=np.intp)
+_FIRST_PIT = np.array((0, PIT_INDICES[1][0], PIT_INDICES[2][0]), dtype=np.intp)
+# _LAP[side]: one seed in each of the 13 cells side sows into (one full lap)
+_LAP = np.zeros((3, 14), dtype=np.int64)
+# _PATH[side, i, r]: one seed in each of the first r cells sown after pit i
+_PATH = np.zeros((3, 14, SOW_CYCLE_LEN, 14), dtype=np.int64)
+for _side in (1, 2):
+    _LAP[_side, list(SOW_CYCLE[_side])] = 1
+    for _i in PIT_INDICES[_side]:
+        for _r in range(SOW_CYCLE_LEN):
+            _PATH[_side, _i, _r, list(SOW_PATH[_side][_i][_r])] = 1
+
+
+def as_boards(boards) -> np.ndarray:
+    """(N, 14) int64 array from an array-like of 14-cell rows or from board objects with .cells."""
+    if len(boards) and hasattr(boards[0], "cells"):
+        boards = [board.cells for board in boards]
+    array = np.asarray(boards, dtype=np.int64)
+    if array.ndim != 2 or array.shape[1] != 14:
+        raise ValueError(f"Expected an (N, 14) array of boards, got shape {array.shape}.")
+    return array
+
+
+def _sides(sides, n: int) -> np.ndarray:
+    sides = np.broadcast_to(np.asarray(sides), (n,))
+    if not np.isin(sides, (1, 2)).all():
+        raise ValueError("Sides must be 1 or 2.")
+    return sides
+
+
+def side_features(boards: np.ndarray, side: int):
+    """
+    Batched _side_features for one side: (captures, tempo, distribution, mobility),
+    each an (N,) array.
+    """
+    pits = _PITS[side]
+    seeds = boards[:, pits]
+    playable = seeds > 0
+    mobility = playable.sum(axis=1)
+
+    last = _LANDING[side][pits, seeds % SOW_CYCLE_LEN]
+    tempo = (playable & (last == STORE_INDEX[side])).sum(axis=1)
+    opposite_count = np.take_along_axis(boards, _OPPOSITE[last], axis=1)
+    capturing = (playable & _OWN_PIT[side][last]
+                 & (np.take_along_axis(boards, last, axis=1) == 0) & (opposite_count > 0))
+    captures = np.where(capturing, opposite_count + 1, 0).sum(axis=1)
+
+    # variance summed pit by pit, like the scalar loop, so the rounding is the same
+    total = seeds.sum(axis=1)
+    avg = total / 6
+    variance = np.zeros(len(boards))
+    for k in range(6):
+        variance = variance + (seeds[:, k] - avg) ** 2
+    distribution = np.where(total == 0, 0.0, -(variance / 6) * 0.1)
+    return captures, tempo, distribution, mobility
+
+
+def evaluate_H1(boards, sides) -> np.ndarray:
+    """Store difference for `sides`, as Game.evaluate_H1; (N,) int64."""
+    boards = as_boards(boards)
+    sides = _sides(sides, len(boards))
+    diff = boards[:, STORE_INDEX[1]] - boards[:, STORE_INDEX[2]]
+    return np.where(sides == 1, diff, -diff)
+
+
+def evaluate_H2(boards, sides) -> np.ndarray:
+    """Weighted H2 score for `sides`, as Game.evaluate_H2; (N,) float64."""
+    boards = as_boards(boards)
+    sides = _sides(sides, len(boards))
+    side_one = sides == 1
+    features1 = side_features(boards, 1)
+    features2 = side_features(boards, 2)
+    comp = [np.where(side_one, f1, f2) for f1, f2 in zip(features1, features2)]
+    human = [np.where(side_one, f2, f1) for f1, f2 in zip(features1, features2)]
+
+    score_diff = evaluate_H1(boards, sides)
+    capture_advantage = comp[0] - human[0]
+    tempo_advantage = comp[1] - human[1]
+    distribution_advantage = comp[2] - human[2]
+    mobility_advantage = comp[3] - human[3]
+    return (1.0 * score_diff +
+            0.5 * capture_advantage +
+            0.3 * tempo_advantage +
+            0.2 * distribution_advantage +
+            0.1 * mobility_advantage)
+
+
+def evaluate_batch(boards, sides, heuristic: str = "H1") -> np.ndarray:
+    """Game.evaluate for every board: H1 or H2 from the point of view of `sides` (scalar or (N,))."""
+    if heuristic == "H1":
+        return evaluate_H1(boards, sides)
+    if heuristic == "H2":
+        return evaluate_H2(boards, sides)
+    raise ValueError(f"Unknown heuristic {heuristic!r}, expected H1 or H2.")
+
+
+class BatchBoard:
+    """
+    N games in one (N, 14) int64 array (FastMancalaBoard cell layout) plus the
+    side to move of each game. A move is a pit offset 0-5 on the mover's side
+    (A-F for Player 1, G-L for Player 2); -1 leaves a game untouched.
+    """
+
+    def __init__(self, n: int, seeds_per_pit: int = 4):
+        self.cells = np.full((n, 14), seeds_per_pit, dtype=np.int64)
+        self.cells[:, STORE_INDEX[1]] = 0
+        self.cells[:, STORE_INDEX[2]] = 0
+        self.to_move = np.ones(n, dtype=np.intp)
+
+    @classmethod
+    def from_cells(cls, cells, to_move=1) -> "BatchBoard":
+        games = cls.__new__(cls)
+        games.cells = as_boards(cells).copy()
+        games.to_move = np.array(_sides(to_move, len(games.cells)), dtype=np.intp)
+        return games
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def copy(self) -> "BatchBoard":
+        return BatchBoard.from_cells(self.cells, self.to_move)
+
+    def side_pits(self) -> np.ndarray:
+        """(N, 6) seeds in the pits of the side to move."""
+        return np.where((self.to_move == 1)[:, None], self.cells[:, 0:6], self.cells[:, 7:13])
+
+    def game_over(self) -> np.ndarray:
+        """(N,) True where one side has no seeds left in its pits."""
+        return (self.cells[:, 0:6].sum(axis=1) == 0) | (self.cells[:, 7:13].sum(axis=1) == 0)
+
+    def legal_moves(self) -> np.ndarray:
+        """(N, 6) mask of the playable pits of the side to move; all False in finished games."""
+        return (self.side_pits() > 0) & ~self.game_over()[:, None]
+
+    def random_moves(self, rng: np.random.Generator) -> np.ndarray:
+        """One uniformly random legal move per game, -1 where there is none."""
+        legal = self.legal_moves()
+        moves = np.argmax(np.where(legal, rng.random(legal.shape), -1.0), axis=1)
+        return np.where(legal.any(axis=1), moves, -1)
+
+    def do_moves(self, moves, sweep: bool = True):
+        """
+        Play moves[g] in every game g where it is >= 0, with the rules of
+        FastMancalaBoard.doMove: full laps, skipping the opponent's store,
+        captures and, with sweep, the end-of-game sweep. Then switch sides.
+        """
+        moves = np.broadcast_to(np.asarray(moves), (len(self),))
+        rows = np.flatnonzero(moves >= 0)
+        if not len(rows):
+            return
+        cells = self.cells
+        side = self.to_move[rows]
+        start = _FIRST_PIT[side] + moves[rows]
+        seeds = cells[rows, start]
+        if (seeds == 0).any():
+            raise ValueError("Cannot play an empty pit.")
+        laps, rest = np.divmod(seeds, SOW_CYCLE_LEN)
+        cells[rows, start] = 0
+        cells[rows] += laps[:, None] * _LAP[side] + _PATH[side, start, rest]
+
+        # Capture rule: last seed in an empty pit on the player's own side
+        last = _LANDING_BY_SIDE[side, start, rest]
+        capturing = _OWN_PIT_BY_SIDE[side, last] & (cells[rows, last] == 1)
+        if capturing.any():
+            rows_c, last_c = rows[capturing], last[capturing]
+            opposite = _OPPOSITE[last_c]
+            cells[rows_c, _STORE[side[capturing]]] += cells[rows_c, opposite] + 1
+            cells[rows_c, opposite] = 0
+            cells[rows_c, last_c] = 0
+
+        if sweep:
+            self.sweep(rows)
+        self.to_move[rows] = 3 - side
+
+    def sweep(self, rows: Optional[np.ndarray] = None):
+        """In finished games (among rows), move each side's remaining seeds to its own store."""
+        if rows is None:
+            rows = np.arange(len(self))
+        cells = self.cells
+        over = rows[(cells[rows, 0:6].sum(axis=1) == 0) | (cells[rows, 7:13].sum(axis=1) == 0)]
+        if not len(over):
+            return
+        for side in (1, 2):
+            first = PIT_INDICES[side][0]
+            cells[over, STORE_INDEX[side]] += cells[over, first:first + 6].sum(axis=1)
+            cells[over, first:first + 6] = 0
+
+    def scores(self) -> np.ndarray:
+        """(N, 2) seeds in the stores of Player 1 and Player 2."""
+        return self.cells[:, [STORE_INDEX[1], STORE_INDEX[2]]]
+
+    def boards(self) -> List[FastMancalaBoard]:
+        return [FastMancalaBoard.from_cells(row) for row in self.cells.tolist()]
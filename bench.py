@@ -0,0 +1,219 @@
+"""
+Benchmarks for the move generator and the search.
+
+    python bench.py                          # perft check + search speed, JSON on stdout
+    python bench.py --out before.json
+    python bench.py --out after.json --compare before.json
+    python bench.py --engines minimax negamax --tables
+
+Three parts:
+* perft: number of leaf positions of the full game tree to a fixed depth from
+  the start and from fixed mid-game positions, on both board engines, checked
+  against the known counts in PERFT_EXPECTED (a correctness check for doMove/undoMove)
+* search: nodes per second of fixed-depth searches with H1 and H2 at several depths,
+  for each engine given with --engines (minimax, negamax, or mcts, which ignores
+  the depth and counts playouts as nodes); --tables gives the alpha-beta engines
+  a transposition table and full move ordering
+* memory: peak Python allocation of one search of each kind from the start
+  (tracemalloc, in a separate run so it does not slow the timed ones)
+"""
+import argparse
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import List, Optional
+
+from mancala import ENGINES, FastMancalaBoard, Game, MancalaBoard, Play
+from ordering import MoveOrdering
+from transposition import TranspositionTable
+
+# Fixed positions, given as the moves that lead to them from the standard start
+# (players alternate, Player 1 first)
+POSITIONS = {
+    "start": "",
+    "mid-8": "FHDIFJEG",
+    "mid-15": "FJDGBJEICHCKDJF",
+    "mid-16": "FJDGBJEICHCKDJFH",
+    "late-20": "BLEIBKCLBIFIDKFLAIEJ",
+}
+PERFT_DEPTH = 7
+# Leaf counts at PERFT_DEPTH; a change here means the rules changed
+PERFT_EXPECTED = {
+    "start": 116944,
+    "mid-8": 59590,
+    "mid-15": 51742,
+    "mid-16": 38436,
+    "late-20": 10064,
+}
+SEARCH_DEPTHS = (6, 8, 10)
+
+
+def position(moves: str, board_class=FastMancalaBoard):
+    """(board, side to move) after playing moves from the start."""
+    board = board_class()
+    side = 1
+    for pit in moves:
+        board.doMove(side, pit, sweep=True)
+        side = 2 if side == 1 else 1
+    return board, side
+
+
+def perft(board, side: int, depth: int) -> int:
+    """Leaf positions of the game tree below board (finished games count as leaves)."""
+    if depth == 0 or board.side_pits_empty(1) or board.side_pits_empty(2):
+        return 1
+    other = 2 if side == 1 else 1
+    total = 0
+    for pit in board.possibleMoves(side):
+        undo = board.doMove(side, pit, sweep=True)
+        total += perft(board, other, depth - 1)
+        board.undoMove(undo)
+    return total
+
+
+def run_perft(depth: int = PERFT_DEPTH) -> List[dict]:
+    results = []
+    for name, moves in POSITIONS.items():
+        for board_class in (FastMancalaBoard, MancalaBoard):
+            board, side = position(moves, board_class)
+            started = time.perf_counter()
+            nodes = perft(board, side, depth)
+            seconds = time.perf_counter() - started
+            expected = PERFT_EXPECTED.get(name) if depth == PERFT_DEPTH else None
+            results.append({
+                "position": name,
+                "board": board_class.__name__,
+                "depth": depth,
+                "nodes": nodes,
+                "ok": expected is None or nodes == expected,
+                "seconds": round(seconds, 4),
+                "nps": round(nodes / seconds) if seconds else None,
+            })
+    return results
+
+
+def _search(moves: str, heuristic: str, depth: int, engine: str = "minimax", tables: bool = False) -> Play:
+    """
+    One fixed-depth search of the position for its side to move; returns the Play used.
+    tables gives the engine a transposition table and full move ordering.
+    """
+    board, side = position(moves)
+    if tables:
+        play = Play(engine=engine, tt=TranspositionTable(), ordering=MoveOrdering())
+    else:
+        play = Play(engine=engine)
+    game = Game(board, human_side=2 if side == 1 else 1, heuristic=heuristic)
+    play.chooseMove(game, depth)
+    return play
+
+
+def run_search(depths=SEARCH_DEPTHS, heuristics=("H1", "H2"), repeat: int = 3, engines=("minimax",),
+               tables: bool = False) -> List[dict]:
+    """Best of `repeat` timed searches per (position, heuristic, depth), then the peak memory of one search."""
+    results = []
+    for engine, heuristic, depth in itertools.product(engines, heuristics, depths):
+        nodes = 0
+        seconds = 0.0
+        for name, moves in POSITIONS.items():
+            best = None
+            for _ in range(repeat):
+                started = time.perf_counter()
+                play = _search(moves, heuristic, depth, engine, tables)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            nodes += play.nodes
+            seconds += best
+        # tracemalloc slows allocation down a lot: one extra search from the start is enough
+        tracemalloc.start()
+        _search(POSITIONS["start"], heuristic, depth, engine, tables)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append({
+            "engine": engine,
+            "tables": tables,
+            "heuristic": heuristic,
+            "depth": depth,
+            "nodes": nodes,
+            "seconds": round(seconds, 4),
+            "nps": round(nodes / seconds) if seconds else None,
+            "peak_bytes": peak,
+        })
+    return results
+
+
+def _revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(perft_depth: int = PERFT_DEPTH, depths=SEARCH_DEPTHS, repeat: int = 3, engines=("minimax",),
+        tables: bool = False) -> dict:
+    return {
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "perft": run_perft(perft_depth),
+        "search": run_search(depths, repeat=repeat, engines=engines, tables=tables),
+    }
+
+
+def compare(old: dict, new: dict) -> List[str]:
+    """Report lines with the change of every timing and memory figure between two runs."""
+    lines = [f"{old.get('revision')} -> {new.get('revision')}"]
+    old_perft = {(r["position"], r["board"], r["depth"]): r for r in old.get("perft", [])}
+    for r in new["perft"]:
+        before = old_perft.get((r["position"], r["board"], r["depth"]))
+        if before and before["nps"] and r["nps"]:
+            lines.append(f"perft {r['position']:>8} {r['board']:<16} nps {r['nps'] / before['nps'] - 1:+7.1%}"
+                         + ("" if r["nodes"] == before["nodes"] else "  NODE COUNT CHANGED"))
+    old_search = {(r.get("engine", "minimax"), r.get("tables", False), r["heuristic"], r["depth"]): r
+                  for r in old.get("search", [])}
+    for r in new["search"]:
+        before = old_search.get((r["engine"], r["tables"], r["heuristic"], r["depth"]))
+        if before and before["nps"] and r["nps"]:
+            lines.append(f"search {r['engine']} {r['heuristic']} depth {r['depth']:<2} nps {r['nps'] / before['nps'] - 1:+7.1%}"
+                         f"  nodes {r['nodes'] - before['nodes']:+d}"
+                         f"  peak memory {r['peak_bytes'] / before['peak_bytes'] - 1:+7.1%}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mancala move generator and search benchmarks.")
+    parser.add_argument("--perft-depth", type=int, default=PERFT_DEPTH)
+    parser.add_argument("--depths", type=int, nargs="+", default=list(SEARCH_DEPTHS), help="search depths to time")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per search (best is kept)")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=["minimax"], help="search engines to time")
+    parser.add_argument("--tables", action="store_true",
+                        help="give every engine a transposition table and full move ordering")
+    parser.add_argument("--out", default=None, help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", default=None, help="earlier JSON results to compare against")
+    args = parser.parse_args()
+
+    results = run(args.perft_depth, args.depths, args.repeat, args.engines, args.tables)
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        for line in compare(old, results):
+            print(line, file=sys.stderr)
+    failed = [r for r in results["perft"] if not r["ok"]]
+    for r in failed:
+        print(f"perft mismatch: {r['position']} on {r['board']}: {r['nodes']} nodes, "
+              f"expected {PERFT_EXPECTED[r['position']]}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
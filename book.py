@@ -0,0 +1,159 @@
+"""
+Opening book: best moves for the first plies of the game, searched offline at high depth.
+
+    python book.py --plies 6 --depth 12 --out opening.book
+
+Every position reachable in the first --plies plies from the standard start
+is searched for its side to move with each heuristic. Entries are keyed by the
+position's Zobrist hash mixed with the side to move and the heuristic, stored
+as fixed-size records sorted by key and looked up by binary search in a memory map.
+"""
+import argparse
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+from typing import List, Optional, Tuple
+
+from mancala import FastMancalaBoard, Game, Play
+from ordering import MoveOrdering
+from transposition import SIDE_KEYS, TranspositionTable, context_key
+
+MAGIC = b"MOB1"
+HEADER = struct.Struct("<4sBBI")  # magic, version, search depth, number of records
+RECORD = struct.Struct("<QBf")    # key, move (0-11 for A-L), value
+VERSION = 1
+PIT_LETTERS = "ABCDEFGHIJKL"
+DEFAULT_BOOK_PATH = "opening.book"
+
+
+def book_key(board, side: int, heuristic: str) -> int:
+    return board.zobrist_hash() ^ SIDE_KEYS[side] ^ context_key(side, heuristic)
+
+
+def opening_positions(plies: int, seeds_per_pit: int = 4) -> List[Tuple[List[int], int]]:
+    """All distinct (cells, side to move) reachable within `plies` plies of the start, game not over."""
+    start = FastMancalaBoard(seeds_per_pit)
+    frontier = [(start, 1)]
+    seen = {(start.hash, 1)}
+    positions = [(start.cells[:], 1)]
+    for _ in range(plies):
+        next_frontier = []
+        for board, side in frontier:
+            other = 2 if side == 1 else 1
+            for pit in board.possibleMoves(side):
+                child = board.copy()
+                child.doMove(side, pit, sweep=True)
+                if child.side_pits_empty(1) or child.side_pits_empty(2):
+                    continue
+                if (child.hash, other) in seen:
+                    continue
+                seen.add((child.hash, other))
+                next_frontier.append((child, other))
+                positions.append((child.cells[:], other))
+        frontier = next_frontier
+    return positions
+
+
+_engine = None
+
+
+def _search_entry(job) -> Tuple[int, int, float]:
+    """Search one book position in a worker process: returns (key, move, value)."""
+    global _engine
+    if _engine is None:
+        _engine = Play(tt=TranspositionTable(1 << 20), ordering=MoveOrdering())
+    cells, side, heuristic, depth = job
+    board = FastMancalaBoard.from_cells(cells)
+    game = Game(board.copy(), human_side=2 if side == 1 else 1, heuristic=heuristic)
+    value, pit = _engine.chooseMove(game, depth)
+    if pit is None:
+        pit = board.possibleMoves(side)[0]
+    return book_key(board, side, heuristic), PIT_LETTERS.index(pit), value
+
+
+def build(path: str, plies: int, depth: int, heuristics=("H1", "H2"), seeds_per_pit: int = 4,
+          workers: Optional[int] = None, progress: bool = False):
+    positions = opening_positions(plies, seeds_per_pit)
+    jobs = [(cells, side, h, depth) for cells, side in positions for h in heuristics]
+    if progress:
+        print(f"{len(positions)} positions, {len(jobs)} searches at depth {depth}")
+    records = []
+    started = time.perf_counter()
+    with multiprocessing.Pool(workers or os.cpu_count()) as pool:
+        for record in pool.imap_unordered(_search_entry, jobs, chunksize=2):
+            records.append(record)
+            if progress and len(records) % 100 == 0:
+                print(f"  {len(records)}/{len(jobs)} ({time.perf_counter() - started:.1f}s)")
+    records.sort()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, depth, len(records)))
+        for key, move, value in records:
+            f.write(RECORD.pack(key, move, value))
+
+
+class OpeningBook:
+    """Read-only, memory-mapped opening book written by build()."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, depth, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a Mancala opening book (version {VERSION}).")
+        self.depth = depth
+        self.count = count
+        self.hits = 0
+        self.misses = 0
+
+    def probe(self, board, side: int, heuristic: str) -> Optional[Tuple[float, str]]:
+        """(value, pit) for side to move on board with heuristic, or None when out of book."""
+        key = book_key(board, side, heuristic)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key, move, value = RECORD.unpack_from(self._map, HEADER.size + mid * RECORD.size)
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                self.hits += 1
+                return value, PIT_LETTERS[move]
+        self.misses += 1
+        return None
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def load_default_book() -> Optional[OpeningBook]:
+    """The book at DEFAULT_BOOK_PATH if one has been built, else None."""
+    if not os.path.exists(DEFAULT_BOOK_PATH):
+        return None
+    try:
+        return OpeningBook(DEFAULT_BOOK_PATH)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a Mancala opening book.")
+    parser.add_argument("--plies", type=int, default=4, help="book covers positions up to this many plies deep")
+    parser.add_argument("--depth", type=int, default=11, help="search depth for every book position")
+    parser.add_argument("--seeds", type=int, default=4, help="seeds per pit")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--out", default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    build(args.out, args.plies, args.depth, seeds_per_pit=args.seeds, workers=args.workers, progress=True)
+    print(f"Wrote {args.out} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
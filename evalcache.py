@@ -0,0 +1,82 @@
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from transposition import context_key
+
+
+class EvalCache:
+    """
+    Bounded LRU cache of leaf evaluations (Game.evaluate), keyed like the
+    transposition table by Zobrist hash, computer side and heuristic, so one
+    cache can be shared by several Play instances of a process (both sides of
+    a CvC game, consecutive games) without mixing up their values.
+
+        cache = EvalCache(size=1 << 16)
+        play = Play(eval_cache=cache)
+        cache.stats()   # hits, misses, hit_rate, evictions
+
+    Only the heuristics listed are cached: H1 is two lookups and cheaper to
+    recompute than to look up.
+    """
+
+    def __init__(self, size: int = 1 << 16, heuristics: Iterable[str] = ("H2",)):
+        if size < 1:
+            raise ValueError("EvalCache size must be >= 1.")
+        self.size = size
+        self.heuristics = frozenset(heuristics)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def evaluate(self, game) -> float:
+        """game.evaluate(), from the cache when this position was evaluated before."""
+        evaluate = self.evaluator(game.playerSide[1], game.heuristic)
+        return evaluate(game) if evaluate is not None else game.evaluate()
+
+    def evaluator(self, comp_side: int, heuristic: str) -> Optional[Callable]:
+        """
+        evaluate(game) for one search (fixed computer side and heuristic), with the
+        key context computed once; None when the heuristic is not cached.
+        """
+        if heuristic not in self.heuristics:
+            return None
+        context = context_key(comp_side, heuristic)
+        entries = self._entries
+        size = self.size
+
+        def evaluate(game) -> float:
+            key = game.state.zobrist_hash() ^ context
+            value = entries.get(key)
+            if value is not None:
+                entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+            value = entries[key] = game.evaluate()
+            if len(entries) > size:
+                entries.popitem(last=False)
+                self.evictions += 1
+            return value
+
+        return evaluate
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "evictions": self.evictions,
+        }
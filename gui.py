@@ -1,15 +1,18 @@
 import pygame
 import sys
-import math
 import copy
 import time
+import os
+import io
 
-from mancala import MancalaBoard, Game, Play
+from mancala import MancalaBoard, FastMancalaBoard, Game, Play
+from book import DEFAULT_BOOK_PATH
+from evalcache import EvalCache
+from records import DEFAULT_RECORD_PATH, GameRecord, RecordWriter, player_settings
+from transposition import TranspositionTable
+from worker import SearchWorker
 
-pygame.init()
 WIDTH, HEIGHT = 980, 520
-WIN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Pink Mancala")
 
 # Colors
 BLUE_LIGHT = (230, 245, 255)
@@ -24,12 +27,14 @@ ACCENT = BLUE_SOFT
 WHITE = (255, 255, 255)
 BLACK = (20, 20, 20)
 
-FONT = pygame.font.SysFont("arial", 22)
-BIGFONT = pygame.font.SysFont("arial", 36)
-SMALL = pygame.font.SysFont("arial", 18)
-
 FPS = 30
-CLOCK = pygame.time.Clock()
+
+# Created on first use (init_fonts / init_display), so importing this module
+# never opens a window and board images can be rendered on a headless server
+WIN = None
+FONT = BIGFONT = SMALL = None
+CLOCK = None
+BOW_IMG = None
 
 # Layout
 PIT_RADIUS = 36
@@ -38,6 +43,32 @@ pit_positions = {
     "L": (220, 120), "K": (320, 120), "J": (420, 120), "I": (520, 120), "H": (620, 120), "G": (720, 120),
 }
 store_positions = {"S1": (80, 240), "S2": (880, 240)}
+store_rects = {"S1": (30, 90, 100, 300), "S2": (850, 90, 100, 300)}
+
+def init_fonts():
+    """Load the fonts; needs no display."""
+    global FONT, BIGFONT, SMALL
+    if FONT is None:
+        pygame.font.init()
+        FONT = pygame.font.SysFont("arial", 22)
+        BIGFONT = pygame.font.SysFont("arial", 36)
+        SMALL = pygame.font.SysFont("arial", 18)
+
+def init_display():
+    """Open the game window (once) and return it."""
+    global WIN, CLOCK, BOW_IMG
+    if WIN is None:
+        pygame.init()
+        WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Pink Mancala")
+        init_fonts()
+        CLOCK = pygame.time.Clock()
+        try:
+            BOW_IMG = pygame.image.load("bow.png").convert_alpha()
+            BOW_IMG = pygame.transform.smoothscale(BOW_IMG, (32, 32))
+        except:
+            BOW_IMG = None
+    return WIN
 
 def draw_button(text, rect, base_color, hover_color, mouse_pos, text_color=WHITE):
     x, y, w, h = rect
@@ -48,39 +79,150 @@ def draw_button(text, rect, base_color, hover_color, mouse_pos, text_color=WHITE
     WIN.blit(label, (x + w//2 - label.get_width()//2, y + h//2 - label.get_height()//2))
     return hovered
 
-def center_text(text, y, font=BIGFONT, color=PINK_DARK):
+def center_text(text, y, font=None, color=PINK_DARK):
+    if font is None:
+        font = BIGFONT
     label = font.render(text, True, color)
     WIN.blit(label, (WIDTH//2 - label.get_width()//2, y))
 
-def draw_board(board: MancalaBoard, highlight_moves=None):
-    if highlight_moves is None:
-        highlight_moves = []
-    WIN.fill(BG)
-
-    # Stores
-    pygame.draw.rect(WIN, BLUE_ACCENT, (30, 90, 100, 300), border_radius=18)
-    pygame.draw.rect(WIN, BLUE_ACCENT, (850, 90, 100, 300), border_radius=18)
+class BoardView:
+    """
+    Draws the board onto a surface, redrawing only the cells whose seed count or
+    highlight changed since the previous frame. Backgrounds, pits and seed-count
+    glyphs are rendered once and blitted afterwards; draw() returns the dirty
+    rectangles for pygame.display.update.
+    """
 
-    # Store counts
-    s1 = FONT.render(str(board.board["S1"]), True, WHITE)
-    s2 = FONT.render(str(board.board["S2"]), True, WHITE)
-    WIN.blit(s1, (store_positions["S1"][0] - s1.get_width()//2, store_positions["S1"][1] - s1.get_height()//2))
-    WIN.blit(s2, (store_positions["S2"][0] - s2.get_width()//2, store_positions["S2"][1] - s2.get_height()//2))
+    def __init__(self, surface=None):
+        self.surface = surface
+        self._background = None
+        self._pits = {}    # highlighted -> pre-rendered pit
+        self._glyphs = {}  # (count, color) -> rendered number
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget what is on screen: the next draw() repaints everything."""
+        self._drawn = {}
+        self._info = None
+
+    def _target(self):
+        return self.surface if self.surface is not None else init_display()
+
+    def _glyph(self, count, color):
+        key = (count, color)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            glyph = self._glyphs[key] = FONT.render(str(count), True, color)
+        return glyph
+
+    def _pit(self, highlighted):
+        pit = self._pits.get(highlighted)
+        if pit is None:
+            size = 2 * (PIT_RADIUS + 6) + 2
+            center = (size // 2, size // 2)
+            pit = pygame.Surface((size, size))
+            pit.fill(BG)
+            if highlighted:
+                pygame.draw.circle(pit, ACCENT, center, PIT_RADIUS + 6)
+            pygame.draw.circle(pit, PINK_MED, center, PIT_RADIUS)
+            pygame.draw.circle(pit, PINK_LIGHT, center, PIT_RADIUS - 6)
+            self._pits[highlighted] = pit
+        return pit
+
+    def _get_background(self):
+        if self._background is None:
+            background = pygame.Surface((WIDTH, HEIGHT))
+            background.fill(BG)
+            for rect in store_rects.values():
+                pygame.draw.rect(background, BLUE_ACCENT, rect, border_radius=18)
+            for text, y in (("Player 2 side (G-L)", 60), ("Player 1 side (A-F)", 440)):
+                label = FONT.render(text, True, PINK_DARK)
+                background.blit(label, (WIDTH//2 - label.get_width()//2, y))
+            self._background = background
+        return self._background
+
+    def draw(self, board: MancalaBoard, highlight_moves=None, info=None, info_y=8):
+        init_fonts()
+        target = self._target()
+        background = self._get_background()
+        dirty = []
+        if not self._drawn:
+            target.blit(background, (0, 0))
+            dirty.append(target.get_rect())
+
+        for store, center in store_positions.items():
+            seeds = board.board[store]
+            if self._drawn.get(store) == seeds:
+                continue
+            rect = pygame.Rect(store_rects[store])
+            target.blit(background, rect, rect)
+            glyph = self._glyph(seeds, WHITE)
+            target.blit(glyph, (center[0] - glyph.get_width()//2, center[1] - glyph.get_height()//2))
+            self._drawn[store] = seeds
+            dirty.append(rect)
+
+        for pit, center in pit_positions.items():
+            state = (board.board[pit], highlight_moves is not None and pit in highlight_moves)
+            if self._drawn.get(pit) == state:
+                continue
+            surface = self._pit(state[1])
+            rect = surface.get_rect(center=center)
+            target.blit(surface, rect)
+            glyph = self._glyph(state[0], BLACK)
+            target.blit(glyph, (center[0] - glyph.get_width()//2, center[1] - glyph.get_height()//2))
+            self._drawn[pit] = state
+            dirty.append(rect)
+
+        if isinstance(info, str):
+            info = (info,)
+        if info is not None and (info, info_y) != self._info:
+            # one or more centred lines at the top of the window
+            lines = len(info) if self._info is None else max(len(info), len(self._info[0]))
+            rect = pygame.Rect(0, info_y, WIDTH, SMALL.get_linesize() * lines)
+            target.blit(background, rect, rect)
+            for k, line in enumerate(info):
+                label = SMALL.render(line, True, PINK_DARK)
+                target.blit(label, (WIDTH//2 - label.get_width()//2, info_y + k * SMALL.get_linesize()))
+            self._info = (info, info_y)
+            dirty.append(rect)
+        return dirty
+
+BOARD_VIEW = BoardView()
+
+def draw_board(board: MancalaBoard, highlight_moves=None, info=None, info_y=8):
+    """
+    Draw the board on the window, with info (one line or a sequence of lines) at
+    the top; returns the rectangles to pass to pygame.display.update.
+    """
+    return BOARD_VIEW.draw(board, highlight_moves, info, info_y)
 
-    # Pits
-    for pit, pos in pit_positions.items():
-        if pit in highlight_moves:
-            pygame.draw.circle(WIN, ACCENT, pos, PIT_RADIUS + 6)
-        pygame.draw.circle(WIN, PINK_MED, pos, PIT_RADIUS)
-        pygame.draw.circle(WIN, PINK_LIGHT, pos, PIT_RADIUS - 6)
+def render_board(board: MancalaBoard, highlight_moves=None, info=None) -> pygame.Surface:
+    """The board drawn on an offscreen surface; no window is opened."""
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    BoardView(surface).draw(board, highlight_moves, info)
+    return surface
 
-        seeds = board.board[pit]
-        txt = FONT.render(str(seeds), True, BLACK)
-        WIN.blit(txt, (pos[0] - txt.get_width()//2, pos[1] - txt.get_height()//2))
+def surface_to_png(surface: pygame.Surface) -> bytes:
+    buffer = io.BytesIO()
+    pygame.image.save(surface, buffer, "board.png")
+    return buffer.getvalue()
 
-    # Labels
-    center_text("Player 2 side (G-L)", 60, FONT, PINK_DARK)
-    center_text("Player 1 side (A-F)", 440, FONT, PINK_DARK)
+def render_replay(moves, seeds_per_pit: int = 4):
+    """
+    PNG images of a game given as a sequence of pit letters (players alternate,
+    Player 1 first): the start position, then the position after every move.
+    """
+    board = FastMancalaBoard(seeds_per_pit)
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    view = BoardView(surface)
+    side = 1
+    view.draw(board, info="Start")
+    yield surface_to_png(surface)
+    for ply, pit in enumerate(moves, 1):
+        board.doMove(side, pit, sweep=True)
+        view.draw(board, info=f"Move {ply}: Player {side} plays {pit}")
+        yield surface_to_png(surface)
+        side = 2 if side == 1 else 1
 
 def pit_at_pos(mouse_pos):
     x, y = mouse_pos
@@ -90,13 +232,44 @@ def pit_at_pos(mouse_pos):
             return pit
     return None
 
-try:
-    BOW_IMG = pygame.image.load("bow.png").convert_alpha()
-    BOW_IMG = pygame.transform.smoothscale(BOW_IMG, (32, 32))
-except:
-    BOW_IMG = None
+# Searches run in a background process so the window keeps responding while the computer thinks
+_search_worker = None
+
+def get_search_worker():
+    global _search_worker
+    if _search_worker is None:
+        book_path = DEFAULT_BOOK_PATH if os.path.exists(DEFAULT_BOOK_PATH) else None
+        # the transposition table and the H2 evaluation cache stay warm across moves and pondering
+        _search_worker = SearchWorker(play_options={"tt": TranspositionTable(), "eval_cache": EvalCache()},
+                                      book_path=book_path)
+    return _search_worker
+
+# Finished games are appended to the game records, one write per game
+_recorder = None
+
+def get_recorder():
+    global _recorder
+    if _recorder is None:
+        _recorder = RecordWriter(DEFAULT_RECORD_PATH, batch_size=1)
+    return _recorder
+
+def search_report(worker: SearchWorker) -> str:
+    """Info bar line about the last finished search: speed and principal variation."""
+    stats = worker.last_stats
+    if stats is None:
+        return ""
+    return f"Last search, depth {stats.depth}: {stats.summary()}"
+
+def quit_gui():
+    if _search_worker is not None:
+        _search_worker.close()
+    if _recorder is not None:
+        _recorder.close()
+    pygame.quit()
+    sys.exit()
 
 def main_menu():
+    init_display()
     while True:
         CLOCK.tick(FPS)
         mouse = pygame.mouse.get_pos()
@@ -156,14 +329,27 @@ def configure_hvc():
                     chosen_side = 2
         pygame.display.update()
 
-    # Step 2: choose depth
+    # Step 2: choose depth, or a time budget (iterative deepening)
     chosen_depth = None
+    time_budget = None
     depths = [3,4,5,6,7,8,9,10]
     btns = []
     start_x = WIDTH//2 - (len(depths)*60)//2 - 10
     y = 220
     for i,d in enumerate(depths):
         btns.append((start_x + i*60, y, 52, 44, d))
+    budgets = [200, 500, 1000, 2000]
+    budget_btns = []
+    start_x = WIDTH//2 - (len(budgets)*110)//2
+    for i,ms in enumerate(budgets):
+        budget_btns.append((start_x + i*110, 340, 100, 44, ms))
+    # Monte Carlo tree search instead of alpha-beta, with a thinking time per move
+    mcts_budgets = [500, 1000, 2000]
+    mcts_btns = []
+    start_x = WIDTH//2 - (len(mcts_budgets)*150)//2
+    for i,ms in enumerate(mcts_budgets):
+        mcts_btns.append((start_x + i*150, 450, 140, 44, ms))
+    engine = "minimax"
 
     while chosen_depth is None:
         CLOCK.tick(FPS)
@@ -172,6 +358,8 @@ def configure_hvc():
         center_text("Choose search depth for COMPUTER", 40)
         center_text("(Computer will use H1 heuristic)", 75, SMALL, PINK_DARK)
         center_text("Depth controls AI lookahead - recommended 4-7", 105, SMALL, PINK_DARK)
+        center_text("...or a thinking time per move (searches as deep as it can)", 300, SMALL, PINK_DARK)
+        center_text("...or Monte Carlo tree search (random playouts, no heuristic)", 410, SMALL, PINK_DARK)
 
         for rect in btns:
             x,y_pos,w,h,d = rect
@@ -179,69 +367,121 @@ def configure_hvc():
             if hovered and pygame.mouse.get_pressed(num_buttons=3)[0]:
                 chosen_depth = d
 
+        for rect in budget_btns:
+            x,y_pos,w,h,ms = rect
+            hovered = draw_button(f"{ms} ms", (x,y_pos,w,h), PINK2, PINK_DARK, mouse)
+            if hovered and pygame.mouse.get_pressed(num_buttons=3)[0]:
+                chosen_depth = 6
+                time_budget = ms
+
+        for rect in mcts_btns:
+            x,y_pos,w,h,ms = rect
+            hovered = draw_button(f"MCTS {ms} ms", (x,y_pos,w,h), PINK2, PINK_DARK, mouse)
+            if hovered and pygame.mouse.get_pressed(num_buttons=3)[0]:
+                chosen_depth = 6
+                time_budget = ms
+                engine = "mcts"
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
 
         pygame.display.update()
 
-    run_hvc_game(human_side=chosen_side, comp_depth=chosen_depth)
+    run_hvc_game(human_side=chosen_side, comp_depth=chosen_depth, time_budget_ms=time_budget, engine=engine)
 
-def run_hvc_game(human_side: int, comp_depth: int):
+def run_hvc_game(human_side: int, comp_depth: int, time_budget_ms=None, engine: str = "minimax"):
+    init_display()
     # Computer uses H1 in Human vs Computer mode
     play = Play(human_side=human_side, heuristic="H1")
     game = play.game
+    worker = get_search_worker()
+    BOARD_VIEW.invalidate()
     turn_side = 1
+    thinking_since = None  # when the current computer search was started
+    result = None
+    pondering = False  # the worker searches ahead while the human thinks
+    computer = (player_settings(time_budget_ms=time_budget_ms, engine=engine) if engine == "mcts"
+                else player_settings("H1", comp_depth, time_budget_ms))
+    human = player_settings(human=True)
+    record = GameRecord.from_board(game.state, [human, computer] if human_side == 1 else [computer, human],
+                                   source="gui")
+    turn_started = time.perf_counter()  # for the move times in the record
 
-    running = True
-    while running:
+    while True:
         CLOCK.tick(FPS)
         
         # Check game over BEFORE drawing
         if game.gameOver():
+            worker.cancel()
             winner, diff = game.findWinner(is_cvc_mode=False)
-            show_result_screen(game.state, winner, diff, "Human vs Computer (H1)")
+            record.finish(game.state)
+            get_recorder().write(record)
+            show_result_screen(game.state, winner, diff, "Human vs Computer (MCTS)" if engine == "mcts" else "Human vs Computer (H1)")
             return
 
-        # Draw board with highlights if it's human's turn
-        if turn_side == game.playerSide[-1]:
-            draw_board(game.state, highlight_moves=game.state.possibleMoves(human_side))
-        else:
-            draw_board(game.state)
-        
+        human_turn = turn_side == game.playerSide[-1]
+        if not human_turn and thinking_since is None:
+            side = game.playerSide[1]
+            if not game.state.possibleMoves(side):
+                turn_side = 1 if turn_side == 2 else 2
+                continue
+            other_side = 1 if side == 2 else 2
+            temp_game = Game(copy.deepcopy(game.state), human_side=other_side, heuristic="H1")
+            worker.start(temp_game, comp_depth, time_budget_ms, engine)
+            thinking_since = time.perf_counter()
+            result = None
+            pondering = False
+        elif human_turn and not pondering:
+            worker.ponder(Game(copy.deepcopy(game.state), human_side=human_side, heuristic="H1"),
+                          comp_depth, time_budget_ms, engine)
+            pondering = True
+
         # Info text
-        info = f"Human is {'Player 1 (A-F)' if human_side==1 else 'Player 2 (G-L)'} | Computer depth: {comp_depth} (H1)"
-        center_text(info, 8, SMALL, PINK_DARK)
-        pygame.display.update()
+        if engine == "mcts":
+            info = f"Human is {'Player 1 (A-F)' if human_side==1 else 'Player 2 (G-L)'} | Computer: MCTS, {time_budget_ms} ms"
+        elif time_budget_ms is not None:
+            info = f"Human is {'Player 1 (A-F)' if human_side==1 else 'Player 2 (G-L)'} | Computer time: {time_budget_ms} ms (H1)"
+        else:
+            info = f"Human is {'Player 1 (A-F)' if human_side==1 else 'Player 2 (G-L)'} | Computer depth: {comp_depth} (H1)"
+        if not human_turn:
+            info += " | Computer is thinking..."
+        info = (info, search_report(worker))
+
+        # Draw board with highlights if it's human's turn; only changed cells reach the screen
+        highlight = game.state.possibleMoves(human_side) if human_turn else None
+        pygame.display.update(draw_board(game.state, highlight, info, 8))
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                quit_gui()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                worker.cancel()
+                return
+
+            if human_turn and event.type == pygame.MOUSEBUTTONDOWN:
+                clicked = pit_at_pos(event.pos)
+                if clicked and clicked in game.state.possibleMoves(human_side):
+                    game.state.doMove(human_side, clicked)
+                    record.add_move(clicked, (time.perf_counter() - turn_started) * 1000)
+                    turn_started = time.perf_counter()
+                    turn_side = 1 if turn_side == 2 else 2
 
-            if turn_side == game.playerSide[-1]:
-                # Human turn
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    clicked = pit_at_pos(event.pos)
-                    if clicked and clicked in game.state.possibleMoves(human_side):
-                        game.state.doMove(human_side, clicked)
-                        turn_side = 1 if turn_side == 2 else 2
-            else:
-                # Computer turn - execute once
-                pygame.time.delay(220)
+        if thinking_since is not None:
+            if result is None:
+                result = worker.poll()
+                searched_ms = (time.perf_counter() - thinking_since) * 1000
+            # keep the computer's reply on screen for at least 220 ms, as before
+            if result is not None and time.perf_counter() - thinking_since >= 0.22:
                 side = game.playerSide[1]
-                other_side = 1 if side == 2 else 2
-                temp_board = copy.deepcopy(game.state)
-                temp_game = Game(temp_board, human_side=other_side, heuristic="H1")
-                val, pit = play.MinimaxAlphaBetaPruning(temp_game, 1, comp_depth, -math.inf, math.inf)
-                
-                moves = game.state.possibleMoves(side)
-                if not moves:
-                    turn_side = 1 if turn_side == 2 else 2
-                    continue
+                val, pit = result
                 if pit is None:
-                    pit = moves[0]
+                    pit = game.state.possibleMoves(side)[0]
                 game.state.doMove(side, pit)
+                record.add_move(pit, searched_ms)
+                turn_started = time.perf_counter()
                 turn_side = 1 if turn_side == 2 else 2
+                thinking_since = None
 
 def configure_cvc():
     # Step 1: depth for Player 1
@@ -267,8 +507,10 @@ def configure_cvc():
                 pygame.quit(); sys.exit()
         pygame.display.update()
 
-    # Step 2: depth for Player 2
+    # Step 2: depth for Player 2, or MCTS with a thinking time
     depth2 = None
+    mcts_ms2 = None
+    mcts_budgets = [500, 1000, 2000]
     while depth2 is None:
         CLOCK.tick(FPS)
         mouse = pygame.mouse.get_pos()
@@ -284,6 +526,15 @@ def configure_cvc():
             if hovered and pygame.mouse.get_pressed(num_buttons=3)[0]:
                 depth2 = d
 
+        center_text("...or Monte Carlo tree search instead of H2", 230, SMALL, PINK_DARK)
+        start_x = WIDTH//2 - (len(mcts_budgets)*150)//2
+        for i,ms in enumerate(mcts_budgets):
+            rect = (start_x + i*150, 270, 140, 44)
+            hovered = draw_button(f"MCTS {ms} ms", rect, PINK2, PINK_DARK, mouse)
+            if hovered and pygame.mouse.get_pressed(num_buttons=3)[0]:
+                depth2 = 6
+                mcts_ms2 = ms
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
@@ -325,67 +576,87 @@ def configure_cvc():
                         buffer += ch
         pygame.display.update()
 
-    run_cvc_game(depth1=depth1, depth2=depth2, delay=delay)
+    run_cvc_game(depth1=depth1, depth2=depth2, delay=delay, mcts_ms2=mcts_ms2)
 
-def run_cvc_game(depth1: int, depth2: int, delay: float):
+def run_cvc_game(depth1: int, depth2: int, delay: float, mcts_ms2=None):
+    init_display()
     # Computer1 uses H1, Computer2 uses H2
     play = Play(human_side=1, heuristic="H1")
     game = play.game
     board = game.state
+    worker = get_search_worker()
+    BOARD_VIEW.invalidate()
     turn_side = 1
+    thinking = False
+    next_move_at = 0.0  # the delay between moves is waited out without blocking the window
+    # mcts_ms2: Player 2 uses Monte Carlo tree search with that thinking time instead of H2
+    p2 = f"MCTS, {mcts_ms2} ms" if mcts_ms2 is not None else f"H2, depth={depth2}"
+    info = f"CvC: P1(H1, depth={depth1}) vs P2({p2}) | Delay={delay}s"
+    p2_settings = (player_settings(time_budget_ms=mcts_ms2, engine="mcts") if mcts_ms2 is not None
+                   else player_settings("H2", depth2))
+    record = GameRecord.from_board(board, [player_settings("H1", depth1), p2_settings], source="gui")
 
     while True:
         CLOCK.tick(FPS)
+        now = time.perf_counter()
         
         # Check game over BEFORE drawing
-        if game.gameOver():
-            winner, diff = game.findWinner(is_cvc_mode=True)
-            show_result_screen(board, winner, diff, f"CvC: P1(H1,d={depth1}) vs P2(H2,d={depth2})")
-            return
-
-        # Draw board
-        draw_board(board)
-        info = f"CvC: P1(H1, depth={depth1}) vs P2(H2, depth={depth2}) | Delay={delay}s"
-        center_text(info, 10, SMALL, PINK_DARK)
-        pygame.display.update()
-
-        # Determine side and heuristic
-        if turn_side == 1:
-            depth = depth1
-            side = 1
-            heuristic = "H1"
-        else:
-            depth = depth2
-            side = 2
-            heuristic = "H2"
-
-        # Create temp game with appropriate heuristic
-        other_side = 1 if side == 2 else 2
-        temp_board = copy.deepcopy(board)
-        temp_game = Game(temp_board, human_side=other_side, heuristic=heuristic)
-        val, pit = play.MinimaxAlphaBetaPruning(temp_game, 1, depth, -math.inf, math.inf)
+        if not thinking and now >= next_move_at:
+            if game.gameOver():
+                winner, diff = game.findWinner(is_cvc_mode=True)
+                record.finish(board)
+                get_recorder().write(record)
+                p2 = f"MCTS,{mcts_ms2}ms" if mcts_ms2 is not None else f"H2,d={depth2}"
+                show_result_screen(board, winner, diff, f"CvC: P1(H1,d={depth1}) vs P2({p2})")
+                return
+
+            # Determine side and heuristic
+            if turn_side == 1:
+                depth = depth1
+                side = 1
+                heuristic = "H1"
+            else:
+                depth = depth2
+                side = 2
+                heuristic = "H2"
 
-        moves = board.possibleMoves(side)
-        if not moves:
-            turn_side = 1 if turn_side == 2 else 2
-            continue
+            if not board.possibleMoves(side):
+                turn_side = 1 if turn_side == 2 else 2
+                continue
 
-        if pit is None:
-            pit = moves[0]
+            # Create temp game with appropriate heuristic
+            other_side = 1 if side == 2 else 2
+            temp_game = Game(copy.deepcopy(board), human_side=other_side, heuristic=heuristic)
+            if side == 2 and mcts_ms2 is not None:
+                worker.start(temp_game, depth, mcts_ms2, "mcts")
+            else:
+                worker.start(temp_game, depth)
+            thinking = True
+            thinking_since = now
 
-        # Perform move
-        board.doMove(side, pit)
-        
-        # Redraw after move
-        draw_board(board)
-        center_text(info, 10, SMALL, PINK_DARK)
-        pygame.display.update()
+        # Draw board
+        pygame.display.update(draw_board(board, None, (info + (" | Thinking..." if thinking else ""), search_report(worker)), 10))
 
-        # Wait
-        wait_ms = int(max(0, delay) * 1000)
-        pygame.time.delay(wait_ms)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                quit_gui()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                worker.cancel()
+                return
+
+        if thinking:
+            result = worker.poll()
+            if result is not None:
+                val, pit = result
+                if pit is None:
+                    pit = board.possibleMoves(turn_side)[0]
 
-        turn_side = 1 if turn_side == 2 else 2
+                # Perform move, then wait before the next search
+                board.doMove(turn_side, pit)
+                record.add_move(pit, (time.perf_counter() - thinking_since) * 1000)
+                next_move_at = time.perf_counter() + max(0, delay)
+                turn_side = 1 if turn_side == 2 else 2
+                thinking = False
 
 def show_result_screen(board: MancalaBoard, winner: str, diff: int, mode_info: str):
     """
@@ -393,30 +664,7 @@ def show_result_screen(board: MancalaBoard, winner: str, diff: int, mode_info: s
     """
     # Create a static surface with the final board once
     final_surface = pygame.Surface((WIDTH, HEIGHT))
-    final_surface.fill(BG)
-    
-    # Draw stores on final surface
-    pygame.draw.rect(final_surface, BLUE_ACCENT, (30, 90, 100, 300), border_radius=18)
-    pygame.draw.rect(final_surface, BLUE_ACCENT, (850, 90, 100, 300), border_radius=18)
-    
-    s1 = FONT.render(str(board.board["S1"]), True, WHITE)
-    s2 = FONT.render(str(board.board["S2"]), True, WHITE)
-    final_surface.blit(s1, (store_positions["S1"][0] - s1.get_width()//2, store_positions["S1"][1] - s1.get_height()//2))
-    final_surface.blit(s2, (store_positions["S2"][0] - s2.get_width()//2, store_positions["S2"][1] - s2.get_height()//2))
-    
-    # Draw pits on final surface
-    for pit, pos in pit_positions.items():
-        pygame.draw.circle(final_surface, PINK_MED, pos, PIT_RADIUS)
-        pygame.draw.circle(final_surface, PINK_LIGHT, pos, PIT_RADIUS - 6)
-        seeds = board.board[pit]
-        txt = FONT.render(str(seeds), True, BLACK)
-        final_surface.blit(txt, (pos[0] - txt.get_width()//2, pos[1] - txt.get_height()//2))
-    
-    # Labels
-    label1 = FONT.render("Player 2 side (G-L)", True, PINK_DARK)
-    final_surface.blit(label1, (WIDTH//2 - label1.get_width()//2, 60))
-    label2 = FONT.render("Player 1 side (A-F)", True, PINK_DARK)
-    final_surface.blit(label2, (WIDTH//2 - label2.get_width()//2, 440))
+    BoardView(final_surface).draw(board)
     
     # Overlay box
     overlay_rect = pygame.Rect(200, 150, 580, 220)
@@ -439,26 +687,30 @@ def show_result_screen(board: MancalaBoard, winner: str, diff: int, mode_info: s
     mode_label = SMALL.render(mode_info, True, PINK_DARK)
     final_surface.blit(mode_label, (WIDTH//2 - mode_label.get_width()//2, 250))
     
-    # Now just display this static surface and handle the button
+    # Now just display this static surface and handle the button;
+    # after the first frame only the button is repainted, and only when its hover state changes
+    WIN.blit(final_surface, (0, 0))
+    pygame.display.update()
+    btn = (WIDTH//2 - 120, 290, 240, 56)
+    shown_hover = None
     while True:
         CLOCK.tick(FPS)
         mouse = pygame.mouse.get_pos()
+        x, y, w, h = btn
+        hovered = x <= mouse[0] <= x + w and y <= mouse[1] <= y + h
         
-        # Blit the static surface
-        WIN.blit(final_surface, (0, 0))
-        
-        # Draw button on top
-        btn = (WIDTH//2 - 120, 290, 240, 56)
-        hovered = draw_button("Return to Menu", btn, PINK2, PINK_DARK, mouse)
+        if hovered != shown_hover:
+            WIN.blit(final_surface, btn, btn)
+            draw_button("Return to Menu", btn, PINK2, PINK_DARK, mouse)
+            pygame.display.update(btn)
+            shown_hover = hovered
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                quit_gui()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if hovered:
                     return
-        
-        pygame.display.update()
 
 if __name__ == "__main__":
     main_menu()
\ No newline at end of file
@@ -1,8 +1,17 @@
 import copy
 import math
+import threading
 import time
+from types import MappingProxyType
 from typing import List, Tuple, Optional
 
+from ordering import MoveOrdering
+from searchstats import SearchStats, TimedBoard, telemetry_record
+from transposition import (
+    EXACT, LOWER, SOLVED_DEPTH, UPPER, SIDE_KEYS, ZOBRIST, ZOBRIST_STEP,
+    TranspositionTable, context_key, zobrist_hash,
+)
+
 
 
 
@@ -38,8 +47,9 @@ class MancalaBoard:
         new.board = self.board.copy()
         new.player1_pits = self.player1_pits
         new.player2_pits = self.player2_pits
-        new.opposite = self.opposite.copy()
-        new.next_pit = self.next_pit.copy()
+        # topology never changes, share it instead of copying
+        new.opposite = self.opposite
+        new.next_pit = self.next_pit
         return new
 
     def possibleMoves(self, player_side: int) -> List[str]:
@@ -55,10 +65,15 @@ class MancalaBoard:
         else:
             return pit in self.player2_pits
 
-    def doMove(self, player_side: int, pit: str):
+    def doMove(self, player_side: int, pit: str, sweep: bool = False):
+        """
+        Play pit for player_side and return an undo record for undoMove().
+        With sweep=True the end-of-game collection is applied (and recorded) too.
+        """
         seeds = self.board[pit]
         if seeds == 0:
             raise ValueError(f"Cannot play empty pit {pit}.")
+        sown = seeds
         self.board[pit] = 0
         current = pit
 
@@ -73,9 +88,11 @@ class MancalaBoard:
             seeds -= 1
 
         # Capture rule: if last seed landed in an empty pit on player's side
+        capture = None
         if current in self.opposite:
             if self.board[current] == 1 and self.is_player_pit(player_side, current):
                 opposite_pit = self.opposite[current]
+                capture = (current, self.board[opposite_pit])
                 captured = self.board[opposite_pit] + self.board[current]
                 self.board[opposite_pit] = 0
                 self.board[current] = 0
@@ -84,6 +101,42 @@ class MancalaBoard:
                 else:
                     self.board['S2'] += captured
 
+        swept = self.collect_remaining_to_store() if sweep else None
+        return (player_side, pit, sown, capture, swept)
+
+    def undoMove(self, undo):
+        """Restore the board exactly as it was before the doMove() that returned undo."""
+        player_side, pit, seeds, capture, swept = undo
+        my_store = 'S1' if player_side == 1 else 'S2'
+        if swept is not None:
+            store, pits, counts = swept
+            for p, c in zip(pits, counts):
+                self.board[p] = c
+            self.board[store] -= sum(counts)
+        if capture is not None:
+            current, opposite_count = capture
+            self.board[self.opposite[current]] = opposite_count
+            self.board[current] = 1
+            self.board[my_store] -= opposite_count + 1
+
+        # un-sow along the same path
+        current = pit
+        remaining = seeds
+        while remaining > 0:
+            current = self.next_pit[current]
+            if player_side == 1 and current == 'S2':
+                continue
+            if player_side == 2 and current == 'S1':
+                continue
+            self.board[current] -= 1
+            remaining -= 1
+        self.board[pit] = seeds
+
+    def preview(self, player_side: int, pit: str) -> Tuple[str, int]:
+        """Where the last seed of pit lands and how many seeds the move captures, without playing it."""
+        board = self.board
+        return _preview([board[name] for name in CELL_NAMES], player_side, pit)
+
     def side_pits_empty(self, player_side: int) -> bool:
         if player_side == 1:
             return all(self.board[p] == 0 for p in self.player1_pits)
@@ -91,22 +144,39 @@ class MancalaBoard:
             return all(self.board[p] == 0 for p in self.player2_pits)
 
     def collect_remaining_to_store(self):
+        """Sweep the non-empty side into its store; returns (store, pits, counts) or None."""
         if self.side_pits_empty(1):
-            total = 0
-            for p in self.player2_pits:
-                total += self.board[p]
-                self.board[p] = 0
-            self.board['S2'] += total
+            store, pits = 'S2', self.player2_pits
         elif self.side_pits_empty(2):
-            total = 0
-            for p in self.player1_pits:
-                total += self.board[p]
-                self.board[p] = 0
-            self.board['S1'] += total
+            store, pits = 'S1', self.player1_pits
+        else:
+            return None
+        counts = tuple(self.board[p] for p in pits)
+        for p in pits:
+            self.board[p] = 0
+        self.board[store] += sum(counts)
+        return (store, pits, counts)
 
     def get_score(self, player_side: int) -> int:
         return self.board['S1'] if player_side == 1 else self.board['S2']
 
+    def zobrist_hash(self) -> int:
+        return zobrist_hash(self.board[name] for name in CELL_NAMES)
+
+    @property
+    def cells(self) -> List[int]:
+        """Snapshot of the 14 cells in CELL_NAMES order (same layout as FastMancalaBoard.cells)."""
+        return [self.board[name] for name in CELL_NAMES]
+
+    @classmethod
+    def from_cells(cls, cells) -> "MancalaBoard":
+        new = cls(0)
+        new.board = dict(zip(CELL_NAMES, cells))
+        return new
+
+    def __reduce__(self):
+        return _reduce_board(self)
+
     def __str__(self):
         top = "  " + " ".join(self.player2_pits[::-1])
         top_vals = "  " + " ".join(str(self.board[p]).rjust(2) for p in self.player2_pits[::-1])
@@ -127,6 +197,283 @@ class MancalaBoard:
 
 
 
+#TODO: class FastMancalaBoard
+
+# Cell layout shared by every board engine: sowing order A..F, S1, G..L, S2.
+CELL_NAMES = ("A", "B", "C", "D", "E", "F", "S1", "G", "H", "I", "J", "K", "L", "S2")
+CELL_INDEX = {name: i for i, name in enumerate(CELL_NAMES)}
+STORE_INDEX = (None, 6, 13)
+PIT_INDICES = (None, (0, 1, 2, 3, 4, 5), (7, 8, 9, 10, 11, 12))
+# OPPOSITE_INDEX[i] is the pit facing pit i (stores map to themselves)
+OPPOSITE_INDEX = tuple(12 - i if i not in (6, 13) else i for i in range(14))
+# SOW_NEXT[side][i] is the next cell a seed from side goes to, skipping the opponent's store
+SOW_NEXT = (
+    None,
+    tuple(0 if i == 12 else (i + 1) % 14 for i in range(14)),
+    tuple(7 if i == 5 else (i + 1) % 14 for i in range(14)),
+)
+# SOW_CYCLE[side] lists the 13 cells a side sows into, in order; CYCLE_POS[side][i] is cell i's place in it
+SOW_CYCLE = (None, tuple(i for i in range(14) if i != 13), tuple(i for i in range(14) if i != 6))
+CYCLE_POS = (None,) + tuple({cell: pos for pos, cell in enumerate(SOW_CYCLE[side])} for side in (1, 2))
+SOW_CYCLE_LEN = 13
+
+
+def _sow_path(side: int, i: int) -> Tuple[int, ...]:
+    """The 12 cells after pit i in side's sowing cycle, in sowing order."""
+    pos = CYCLE_POS[side][i]
+    return tuple(SOW_CYCLE[side][(pos + k) % SOW_CYCLE_LEN] for k in range(1, SOW_CYCLE_LEN))
+
+
+# SOW_PATH[side][i][r]: the first r cells a pit sows into after its full laps (r < 13)
+SOW_PATH = (None,) + tuple(
+    tuple(tuple(_sow_path(side, i)[:r] for r in range(SOW_CYCLE_LEN)) if i in PIT_INDICES[side] else None
+          for i in range(14))
+    for side in (1, 2)
+)
+# LANDING[side][i][seeds % 13]: cell where the last seed sown from pit i lands, for any seed count
+LANDING = (None,) + tuple(
+    tuple((i,) + _sow_path(side, i) if i in PIT_INDICES[side] else None for i in range(14))
+    for side in (1, 2)
+)
+
+
+# search engines selectable with Play(engine=...), and the half-width of the
+# aspiration window aspirationSearch opens around the previous score
+ENGINES = ("minimax", "negamax", "mcts")
+ASPIRATION_WINDOW = 1.0
+
+
+def _reduce_board(board):
+    """Pickle boards as their 14 cells packed into bytes (see packed.py) instead of dicts and lists."""
+    cells = board.cells
+    try:
+        data = bytes(cells)
+    except ValueError:  # a cell above 255 seeds
+        data = list(cells)
+    return type(board).from_cells, (data,)
+
+
+class _CellView:
+    """Dict-like view over a FastMancalaBoard so board.board['A'] keeps working."""
+    __slots__ = ("_owner", "_cells")
+
+    def __init__(self, owner: "FastMancalaBoard"):
+        self._owner = owner
+        self._cells = owner.cells
+
+    def __getitem__(self, name: str) -> int:
+        return self._cells[CELL_INDEX[name]]
+
+    def __setitem__(self, name: str, value: int):
+        i = CELL_INDEX[name]
+        self._owner.hash ^= ZOBRIST[i][self._cells[i]] ^ ZOBRIST[i][value]
+        self._cells[i] = value
+
+    def __contains__(self, name) -> bool:
+        return name in CELL_INDEX
+
+    def __iter__(self):
+        return iter(CELL_NAMES)
+
+    def __len__(self) -> int:
+        return len(CELL_NAMES)
+
+    def keys(self):
+        return CELL_NAMES
+
+    def items(self):
+        return list(zip(CELL_NAMES, self._cells))
+
+    def copy(self) -> dict:
+        return dict(zip(CELL_NAMES, self._cells))
+
+
+def _preview(cells: List[int], player_side: int, pit: str) -> Tuple[str, int]:
+    """preview() on 14 cells: landing cell of pit's last seed and the seeds the move captures."""
+    i = CELL_INDEX[pit]
+    seeds = cells[i]
+    laps, rest = divmod(seeds, SOW_CYCLE_LEN)
+    last = LANDING[player_side][i][rest]
+    count = (cells[last] if last != i else 0) + laps + (1 if rest else 0)
+    if count == 1 and last in PIT_INDICES[player_side]:
+        opposite_pit = OPPOSITE_INDEX[last]
+        reached = opposite_pit in SOW_PATH[player_side][i][rest]
+        return CELL_NAMES[last], cells[opposite_pit] + laps + (1 if reached else 0) + 1
+    return CELL_NAMES[last], 0
+
+
+class FastMancalaBoard:
+    """
+    Same rules and API as MancalaBoard, but the 14 cells live in a flat list
+    (index order CELL_NAMES) and sowing uses the shared index tables above.
+    Nothing topology-related is stored per instance, so copy() is one list copy.
+    The Zobrist hash of the cells is kept up to date incrementally in `hash`.
+    """
+    __slots__ = ("cells", "hash")
+
+    player1_pits = tuple("ABCDEF")
+    player2_pits = tuple("GHIJKL")
+    # read-only name tables, kept for code written against MancalaBoard
+    opposite = MappingProxyType({CELL_NAMES[i]: CELL_NAMES[OPPOSITE_INDEX[i]] for i in PIT_INDICES[1] + PIT_INDICES[2]})
+    next_pit = MappingProxyType({CELL_NAMES[i]: CELL_NAMES[(i + 1) % 14] for i in range(14)})
+
+    _side_moves = (None, tuple(zip(player1_pits, PIT_INDICES[1])), tuple(zip(player2_pits, PIT_INDICES[2])))
+
+    def __init__(self, seeds_per_pit: int = 4):
+        self.cells = [seeds_per_pit] * 14
+        self.cells[6] = 0
+        self.cells[13] = 0
+        self.hash = zobrist_hash(self.cells)
+
+    @property
+    def board(self) -> _CellView:
+        return _CellView(self)
+
+    @classmethod
+    def from_board(cls, board) -> "FastMancalaBoard":
+        return cls.from_cells([board.board[name] for name in CELL_NAMES])
+
+    @classmethod
+    def from_cells(cls, cells: List[int]) -> "FastMancalaBoard":
+        new = cls.__new__(cls)
+        new.cells = list(cells)
+        new.hash = zobrist_hash(new.cells)
+        return new
+
+    def copy(self):
+        new = FastMancalaBoard.__new__(FastMancalaBoard)
+        new.cells = self.cells[:]
+        new.hash = self.hash
+        return new
+
+    def zobrist_hash(self) -> int:
+        return self.hash
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __reduce__(self):
+        return _reduce_board(self)
+
+    def possibleMoves(self, player_side: int) -> List[str]:
+        cells = self.cells
+        return [name for name, i in self._side_moves[player_side] if cells[i] > 0]
+
+    def is_player_pit(self, player_side: int, pit: str) -> bool:
+        return CELL_INDEX.get(pit) in PIT_INDICES[player_side]
+
+    def doMove(self, player_side: int, pit: str, sweep: bool = False):
+        """Same contract as MancalaBoard.doMove: returns an undo record for undoMove()."""
+        cells = self.cells
+        start = i = CELL_INDEX[pit]
+        seeds = cells[i]
+        if seeds == 0:
+            raise ValueError(f"Cannot play empty pit {pit}.")
+        old_hash = self.hash
+        h = old_hash ^ ZOBRIST[i][seeds] ^ ZOBRIST[i][0]
+        cells[i] = 0
+        if seeds < SOW_CYCLE_LEN:
+            path = SOW_PATH[player_side][start][seeds]
+        else:
+            laps, rest = divmod(seeds, SOW_CYCLE_LEN)
+            # every full lap drops one seed in each of the 13 cells at once
+            for c in SOW_CYCLE[player_side]:
+                count = cells[c]
+                h ^= ZOBRIST[c][count] ^ ZOBRIST[c][count + laps]
+                cells[c] = count + laps
+            path = SOW_PATH[player_side][start][rest]
+        step = ZOBRIST_STEP
+        for c in path:
+            count = cells[c]
+            h ^= step[c][count]
+            cells[c] = count + 1
+        i = path[-1] if path else start
+
+        # Capture rule: last seed in an empty pit on the player's own side
+        capture = None
+        if cells[i] == 1 and i in PIT_INDICES[player_side]:
+            opposite_pit = OPPOSITE_INDEX[i]
+            store = STORE_INDEX[player_side]
+            opposite_count = cells[opposite_pit]
+            capture = (i, opposite_count)
+            h ^= (ZOBRIST[opposite_pit][opposite_count] ^ ZOBRIST[opposite_pit][0]
+                  ^ ZOBRIST[i][1] ^ ZOBRIST[i][0]
+                  ^ ZOBRIST[store][cells[store]] ^ ZOBRIST[store][cells[store] + opposite_count + 1])
+            cells[store] += opposite_count + 1
+            cells[opposite_pit] = 0
+            cells[i] = 0
+        self.hash = h
+
+        swept = self.collect_remaining_to_store() if sweep else None
+        return (player_side, start, seeds, capture, swept, old_hash)
+
+    def undoMove(self, undo):
+        player_side, i, seeds, capture, swept, old_hash = undo
+        cells = self.cells
+        self.hash = old_hash
+        if swept is not None:
+            side, counts = swept
+            first = PIT_INDICES[side][0]
+            cells[first:first + 6] = counts
+            cells[STORE_INDEX[side]] -= sum(counts)
+        if capture is not None:
+            last, opposite_count = capture
+            cells[OPPOSITE_INDEX[last]] = opposite_count
+            cells[last] = 1
+            cells[STORE_INDEX[player_side]] -= opposite_count + 1
+
+        if seeds < SOW_CYCLE_LEN:
+            for c in SOW_PATH[player_side][i][seeds]:
+                cells[c] -= 1
+        else:
+            laps, rest = divmod(seeds, SOW_CYCLE_LEN)
+            for c in SOW_PATH[player_side][i][rest]:
+                cells[c] -= 1
+            for c in SOW_CYCLE[player_side]:
+                cells[c] -= laps
+        cells[i] = seeds
+
+    def preview(self, player_side: int, pit: str) -> Tuple[str, int]:
+        """Where the last seed of pit lands and how many seeds the move captures, without playing it."""
+        return _preview(self.cells, player_side, pit)
+
+    def side_pits_empty(self, player_side: int) -> bool:
+        cells = self.cells
+        for i in PIT_INDICES[player_side]:
+            if cells[i]:
+                return False
+        return True
+
+    def collect_remaining_to_store(self):
+        """Sweep the non-empty side into its store; returns (side, counts) or None."""
+        cells = self.cells
+        if self.side_pits_empty(1):
+            side = 2
+        elif self.side_pits_empty(2):
+            side = 1
+        else:
+            return None
+        first = PIT_INDICES[side][0]
+        counts = cells[first:first + 6]
+        h = self.hash
+        for i, c in enumerate(counts, first):
+            h ^= ZOBRIST[i][c] ^ ZOBRIST[i][0]
+        store = STORE_INDEX[side]
+        total = sum(counts)
+        h ^= ZOBRIST[store][cells[store]] ^ ZOBRIST[store][cells[store] + total]
+        self.hash = h
+        cells[first:first + 6] = [0, 0, 0, 0, 0, 0]
+        cells[store] += total
+        return (side, counts)
+
+    def get_score(self, player_side: int) -> int:
+        return self.cells[STORE_INDEX[player_side]]
+
+    __str__ = MancalaBoard.__str__
+
+
+
+
 
 
 
@@ -145,6 +492,42 @@ class MancalaBoard:
 
 #TODO: class Game
 
+def _side_features(cells: List[int], player_side: int) -> Tuple[int, int, float, int]:
+    """
+    Critères H2 d'un camp en un seul passage sur ses 6 trous:
+    (captures potentielles, coups tempo, distribution, mobilité).
+    """
+    pits = PIT_INDICES[player_side]
+    store = STORE_INDEX[player_side]
+    landing = LANDING[player_side]
+    captures = 0
+    tempo_moves = 0
+    mobility = 0
+    total = 0
+    for i in pits:
+        seeds = cells[i]
+        if seeds == 0:
+            continue
+        mobility += 1
+        total += seeds
+        last = landing[i][seeds % SOW_CYCLE_LEN]
+        if last == store:
+            tempo_moves += 1
+        elif last in pits and cells[last] == 0:
+            opposite_count = cells[OPPOSITE_INDEX[last]]
+            if opposite_count > 0:
+                captures += opposite_count + 1
+
+    if total == 0:
+        return captures, tempo_moves, 0, mobility
+    # même calcul (et même arrondi) que la version d'origine: variance sur les 6 trous
+    avg = total / 6
+    variance = 0
+    for i in pits:
+        variance += (cells[i] - avg) ** 2
+    return captures, tempo_moves, -(variance / 6) * 0.1, mobility
+
+
 class Game:
     def __init__(self, board: Optional[MancalaBoard] = None, human_side: int = 1, heuristic: str = "H1"):
         self.state = board if board is not None else MancalaBoard()
@@ -185,11 +568,7 @@ class Game:
         """
         H1 - Heuristique simple: différence de graines dans les stores
         """
-        comp_side = self.playerSide[1]
-        human_side = self.playerSide[-1]
-        comp_store = self.state.board['S1'] if comp_side == 1 else self.state.board['S2']
-        human_store = self.state.board['S1'] if human_side == 1 else self.state.board['S2']
-        return comp_store - human_store
+        return self.state.get_score(self.playerSide[1]) - self.state.get_score(self.playerSide[-1])
 
     def evaluate_H2(self) -> float:
         """
@@ -202,30 +581,25 @@ class Game:
         """
         comp_side = self.playerSide[1]
         human_side = self.playerSide[-1]
+        cells = self.state.cells
         
         # 1. Score de base (stores)
-        comp_store = self.state.board['S1'] if comp_side == 1 else self.state.board['S2']
-        human_store = self.state.board['S1'] if human_side == 1 else self.state.board['S2']
-        score_diff = comp_store - human_store
+        score_diff = cells[STORE_INDEX[comp_side]] - cells[STORE_INDEX[human_side]]
+        
+        # 2-5. Un seul passage par camp, avec la table des points d'arrivée
+        comp_captures, comp_tempo, comp_distribution, comp_mobility = _side_features(cells, comp_side)
+        human_captures, human_tempo, human_distribution, human_mobility = _side_features(cells, human_side)
         
         # 2. Captures potentielles
-        comp_captures = self._count_potential_captures(comp_side)
-        human_captures = self._count_potential_captures(human_side)
         capture_advantage = comp_captures - human_captures
         
         # 3. Contrôle du tempo (possibilité de rejouer)
-        comp_tempo = self._count_tempo_moves(comp_side)
-        human_tempo = self._count_tempo_moves(human_side)
         tempo_advantage = comp_tempo - human_tempo
         
         # 4. Distribution des graines
-        comp_distribution = self._evaluate_distribution(comp_side)
-        human_distribution = self._evaluate_distribution(human_side)
         distribution_advantage = comp_distribution - human_distribution
         
         # 5. Mobilité (nombre de coups possibles)
-        comp_mobility = len(self.state.possibleMoves(comp_side))
-        human_mobility = len(self.state.possibleMoves(human_side))
         mobility_advantage = comp_mobility - human_mobility
         
         # Combinaison pondérée
@@ -239,76 +613,15 @@ class Game:
 
     def _count_potential_captures(self, player_side: int) -> int:
         """Compte les captures potentielles au prochain coup"""
-        captures = 0
-        pits = self.state.player1_pits if player_side == 1 else self.state.player2_pits
-        
-        for pit in pits:
-            seeds = self.state.board[pit]
-            if seeds == 0:
-                continue
-            
-            # Simuler où la dernière graine va tomber
-            current = pit
-            temp_seeds = seeds
-            while temp_seeds > 0:
-                current = self.state.next_pit[current]
-                if player_side == 1 and current == 'S2':
-                    continue
-                if player_side == 2 and current == 'S1':
-                    continue
-                temp_seeds -= 1
-            
-            # Vérifier si c'est une capture
-            if current in self.state.opposite:
-                if self.state.board[current] == 0 and self.state.is_player_pit(player_side, current):
-                    opposite_pit = self.state.opposite[current]
-                    if self.state.board[opposite_pit] > 0:
-                        captures += self.state.board[opposite_pit] + 1
-        
-        return captures
+        return _side_features(self.state.cells, player_side)[0]
 
     def _count_tempo_moves(self, player_side: int) -> int:
         """Compte les coups qui permettent de rejouer (finir dans son store)"""
-        tempo_moves = 0
-        pits = self.state.player1_pits if player_side == 1 else self.state.player2_pits
-        my_store = 'S1' if player_side == 1 else 'S2'
-        
-        for pit in pits:
-            seeds = self.state.board[pit]
-            if seeds == 0:
-                continue
-            
-            # Simuler où la dernière graine va tomber
-            current = pit
-            temp_seeds = seeds
-            while temp_seeds > 0:
-                current = self.state.next_pit[current]
-                if player_side == 1 and current == 'S2':
-                    continue
-                if player_side == 2 and current == 'S1':
-                    continue
-                temp_seeds -= 1
-            
-            if current == my_store:
-                tempo_moves += 1
-        
-        return tempo_moves
+        return _side_features(self.state.cells, player_side)[1]
 
     def _evaluate_distribution(self, player_side: int) -> float:
         """Évalue la qualité de la distribution des graines"""
-        pits = self.state.player1_pits if player_side == 1 else self.state.player2_pits
-        seeds_list = [self.state.board[p] for p in pits]
-        
-        if sum(seeds_list) == 0:
-            return 0
-        
-        # Pénaliser les distributions déséquilibrées
-        # Une bonne distribution = graines réparties uniformément
-        avg = sum(seeds_list) / len(seeds_list)
-        variance = sum((s - avg) ** 2 for s in seeds_list) / len(seeds_list)
-        
-        # Plus la variance est faible, meilleure est la distribution
-        return -variance * 0.1
+        return _side_features(self.state.cells, player_side)[2]
 
     def evaluate(self) -> float:
         """
@@ -359,8 +672,81 @@ class Game:
 
 
 class Play:
-    def __init__(self, human_side: int = 1, heuristic: str = "H1"):
-        self.game = Game(MancalaBoard(), human_side=human_side, heuristic=heuristic)
+    def __init__(self, human_side: int = 1, heuristic: str = "H1", fast_board: bool = True, in_place: bool = True,
+                 tt: Optional[TranspositionTable] = None, ordering: Optional[MoveOrdering] = None,
+                 workers: int = 1, tablebase=None, book=None, stats: Optional[SearchStats] = None,
+                 telemetry=None, engine: str = "minimax", mcts=None, eval_cache=None):
+        # fast_board=False keeps the original dict-based MancalaBoard (reference engine)
+        board = FastMancalaBoard() if fast_board else MancalaBoard()
+        self.game = Game(board, human_side=human_side, heuristic=heuristic)
+        # in_place: search walks one board with doMove/undoMove instead of deep-copying each child
+        self.in_place = in_place
+        # optional transposition table, kept across moves (and shared by both sides in CvC)
+        self.tt = tt
+        self._tt_context = 0
+        # move ordering policy and its cutoff counters; default only tries PV / hash moves first
+        self.ordering = ordering if ordering is not None else MoveOrdering.pv_only()
+        self._default_ordering = ordering is None
+        # workers > 1: fixed-depth searches split the root moves over a process pool
+        self.workers = workers
+        self._parallel = None
+        # optional tablebase.Tablebase: exact values once few seeds are left
+        self.tablebase = tablebase
+        # optional book.OpeningBook: answers instantly while the game is still in the book
+        self.book = book
+        # optional SearchStats filled in by every chooseMove; telemetry(record) receives
+        # one dict per searched move (e.g. searchstats.JsonLinesLog) and needs stats
+        self.telemetry = telemetry
+        self.stats = stats if stats is not None or telemetry is None else SearchStats()
+        # "minimax": MinimaxAlphaBetaPruning; "negamax": Play._negamax behind aspirationSearch,
+        # with windows centred on the previous score, kept per (computer side, heuristic)
+        self._last_score = {}
+        self._engine = "minimax"
+        self.engine = engine
+        # "mcts": mcts.MCTS used instead of alpha-beta (a default one is created when needed);
+        # its values are expected results between 0 (loss) and 1 (win)
+        self.mcts = mcts
+        # optional evalcache.EvalCache for the leaf evaluations; may be shared between Plays
+        self.eval_cache = eval_cache
+        self._evaluate = Game.evaluate
+        # results searched ahead by ponder(), keyed by position and search settings;
+        # chooseMove answers from here at once when the human's reply was pondered
+        self._ponder_cache = {}
+        self._ponder_thread = None
+        self._ponder_stop = None
+        self._outer_stop_check = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        # time-budgeted search state (see iterativeDeepening)
+        self.nodes = 0
+        self._deadline = None
+        self._stopped = False
+        # leaves evaluated at the depth limit (or read from the table at a limited depth);
+        # an iteration that counts none has searched every line to the end of the game
+        self._horizon_leaves = 0
+        # optional callable polled during search; returning True abandons the search
+        self.stop_check = None
+        self._collect_pv = False
+        self._follow_pv = False
+        self._pv_line = []
+        self._pv_table = []
+
+    @property
+    def engine(self) -> str:
+        return self._engine
+
+    @engine.setter
+    def engine(self, engine: str):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {', '.join(ENGINES)}.")
+        # the zero-window re-searches only pay off with a table and good ordering: negamax
+        # gets full ordering unless the caller chose their own, and a table if it has none
+        # (the table is kept when switching back, it only helps the other engine)
+        if self._default_ordering and (engine == "negamax") != (self._engine == "negamax"):
+            self.ordering = MoveOrdering() if engine == "negamax" else MoveOrdering.pv_only()
+        if engine == "negamax" and self.tt is None:
+            self.tt = TranspositionTable()
+        self._engine = engine
 
     def humanTurn(self):
         gs = self.game.state
@@ -381,73 +767,578 @@ class Play:
             else:
                 print("Invalid choice, try again.")
 
-    def computerTurn(self, depth: int = 6) -> Optional[str]:
-        val, pit = self.MinimaxAlphaBetaPruning(self.game, 1, depth, -math.inf, math.inf)
+    def computerTurn(self, depth: int = 6, time_budget_ms: Optional[float] = None) -> Optional[str]:
+        val, pit = self.chooseMove(self.game, depth, time_budget_ms)
         comp_side = self.game.playerSide[1]
         if pit is None:
             moves = self.game.state.possibleMoves(comp_side)
             if not moves:
                 return None
             pit = moves[0]
-        print(f"Computer (side {comp_side}) chooses pit {pit} (value={val:.2f}, heuristic={self.game.heuristic})")
+        if time_budget_ms is not None or self.engine == "mcts":
+            depth = self.last_depth
+        print(f"Computer (side {comp_side}) chooses pit {pit} (value={val:.2f}, depth={depth}, heuristic={self.game.heuristic})")
+        if self.stats is not None:
+            print(self.stats.summary())
         self.game.state.doMove(comp_side, pit)
         return pit
 
+    def chooseMove(self, game: Game, depth: int = 6, time_budget_ms: Optional[float] = None) -> Tuple[float, Optional[str]]:
+        """
+        Search game for the computer (MAX) side: fixed depth, or iterative
+        deepening within time_budget_ms milliseconds when a budget is given.
+        Positions found in the opening book are answered without searching.
+        With self.stats set, the search is measured and reported to self.telemetry.
+        A position already searched by ponder() with the same settings is answered at once.
+        """
+        stats = self.stats
+        if self._ponder_cache:
+            # pondered results are only good for this turn
+            hit = self._ponder_cache.get(self._ponderKey(game, depth, time_budget_ms))
+            self._ponder_cache = {}
+            if hit is None:
+                self.ponder_misses += 1
+            else:
+                self.ponder_hits += 1
+                value, pit, self.last_depth, pondered_stats = hit
+                if stats is not None and pondered_stats is not None:
+                    stats.__dict__.update(copy.deepcopy(pondered_stats.__dict__))
+                    stats.pondered = True
+                return value, pit
+        if stats is None:
+            return self._chooseMove(game, depth, time_budget_ms)
+        stats.reset()
+        o = self.ordering
+        before = (self.nodes, o.nodes, o.children, o.cutoffs, o.first_move_cutoffs)
+        started = time.perf_counter()
+        value, pit = self._chooseMove(game, depth, time_budget_ms)
+        stats.elapsed = time.perf_counter() - started
+        stats.nodes = self.nodes - before[0]
+        stats.interior_nodes = o.nodes - before[1]
+        stats.children = o.children - before[2]
+        stats.cutoffs = o.cutoffs - before[3]
+        stats.first_move_cutoffs = o.first_move_cutoffs - before[4]
+        stats.depth, stats.value, stats.move = self.last_depth, value, pit
+        if self.telemetry is not None:
+            self.telemetry(telemetry_record(stats, game.playerSide[1], game.heuristic, time_budget_ms))
+        return value, pit
+
+    def _chooseMove(self, game: Game, depth: int, time_budget_ms: Optional[float]) -> Tuple[float, Optional[str]]:
+        stats = self.stats
+        if self.book is not None:
+            comp_side = game.playerSide[1]
+            hit = self.book.probe(game.state, comp_side, game.heuristic)
+            if hit is not None and hit[1] in game.state.possibleMoves(comp_side):
+                self.last_depth = self.book.depth
+                if stats is not None:
+                    stats.source, stats.pv = "book", [hit[1]]
+                return hit
+        if self.engine == "mcts":
+            value, pit = self.mctsSearch(game, time_budget_ms)
+            if stats is not None:
+                stats.source, stats.pv = "mcts", [pit] if pit is not None else []
+            return value, pit
+        if time_budget_ms is not None:
+            value, pit, self.last_depth = self.iterativeDeepening(game, time_budget_ms)
+            if stats is not None:
+                stats.pv = list(self._pv_line)
+            return value, pit
+        self.last_depth = depth
+        if self.workers > 1 and depth > 1 and not game.gameOver():
+            value, pit = self.parallelSearch(game, depth)
+            if stats is not None:
+                stats.source, stats.pv = "parallel", [pit] if pit is not None else []
+            return value, pit
+        if stats is None:
+            return self._rootSearch(game, depth)
+        # collect the principal variation for the report
+        self._collect_pv = True
+        self._pv_table = [[] for _ in range(depth + 1)]
+        try:
+            value, pit = self._rootSearch(game, depth)
+        finally:
+            self._collect_pv = False
+        stats.pv = self._pv_table[0]
+        return value, pit
+
+    def _rootSearch(self, game: Game, depth: int, center: Optional[float] = None) -> Tuple[float, Optional[str]]:
+        """One full-width search with the selected engine; center is the expected score, if known."""
+        if self.engine == "minimax":
+            return self.MinimaxAlphaBetaPruning(game, 1, depth, -math.inf, math.inf)
+        context = (game.playerSide[1], game.heuristic)
+        if center is None:
+            center = self._last_score.get(context)
+        value, pit = self.aspirationSearch(game, depth, center)
+        if not self._stopped:
+            self._last_score[context] = value
+        return value, pit
+
+    def aspirationSearch(self, game: Game, depth: int, center: Optional[float]) -> Tuple[float, Optional[str]]:
+        """
+        Play._negamax (entered through NegamaxPVS) inside a narrow window around
+        center. A result on or outside the window is only a bound, so that side of
+        the window is opened and the search repeated; the final value is the same
+        as with a full window.
+        """
+        if center is None or depth <= 2:
+            return self.NegamaxPVS(game, depth)
+        alpha, beta = center - ASPIRATION_WINDOW, center + ASPIRATION_WINDOW
+        while True:
+            value, pit = self.NegamaxPVS(game, depth, alpha, beta)
+            if self._stopped:
+                return value, pit
+            if value <= alpha:
+                alpha = -math.inf
+            elif value >= beta:
+                beta = math.inf
+            else:
+                return value, pit
+
+    def parallelSearch(self, game: Game, depth: int) -> Tuple[float, Optional[str]]:
+        """
+        Root-parallel search over self.workers processes. Returns the same (value, pit)
+        as MinimaxAlphaBetaPruning expanding the root moves in the same order.
+        """
+        if self._parallel is None:
+            from parallel import ParallelSearch
+            o = self.ordering
+            options = {
+                "in_place": self.in_place,
+                "tt": TranspositionTable(self.tt.size, self.tt.policy) if self.tt is not None else None,
+                "ordering": MoveOrdering(o.use_pv, o.use_killers, o.use_history, o.use_static, o.max_ply),
+            }
+            if self.eval_cache is not None:
+                # caches cannot be shared between processes: each worker gets its own
+                from evalcache import EvalCache
+                options["eval_cache"] = EvalCache(self.eval_cache.size, self.eval_cache.heuristics)
+            if self.tablebase is not None:
+                # a memory map cannot be pickled: each worker maps the file itself
+                options["tablebase_path"] = self.tablebase.path
+            self._parallel = ParallelSearch(self.workers, options)
+        side = game.playerSide[1]
+        moves = self.ordering.order(game.state, side, game.state.possibleMoves(side), 0)
+        return self._parallel.search(game, depth, moves)
+
+    def mctsSearch(self, game: Game, time_budget_ms: Optional[float] = None) -> Tuple[float, Optional[str]]:
+        """
+        Monte Carlo tree search for the computer side, within time_budget_ms or
+        the engine's own budget. last_depth is the deepest tree level reached
+        and every iteration counts as one node.
+        """
+        if self.mcts is None:
+            from mcts import MCTS
+            self.mcts = MCTS()
+        engine = self.mcts
+        value, pit = engine.search(game.state, game.playerSide[1], time_budget_ms, self.stop_check)
+        self.last_depth = engine.last_depth
+        self.nodes += engine.last_iterations
+        return value, pit
+
+    def _ponderKey(self, game: Game, depth: int, time_budget_ms: Optional[float]) -> tuple:
+        return (bytes(game.state.cells), game.playerSide[1], game.heuristic, self.engine,
+                depth if time_budget_ms is None else None, time_budget_ms)
+
+    def ponder(self, game: Optional[Game] = None, depth: int = 6, time_budget_ms: Optional[float] = None,
+               predicted: Optional[str] = None) -> int:
+        """
+        Search ahead while the human thinks: for each reply of the human in
+        game (predicted first, e.g. the second move of the last principal
+        variation of the last search by default), search the resulting position for the computer exactly as
+        chooseMove(depth, time_budget_ms) would and keep the result. Runs until
+        every reply is done or stop_check() returns True; a search cut short is
+        dropped. Returns the number of replies searched.
+        """
+        game = game if game is not None else self.game
+        self._ponder_cache = {}
+        board = game.state
+        human = game.playerSide[-1]
+        if board.side_pits_empty(1) or board.side_pits_empty(2):
+            return 0
+        replies = board.possibleMoves(human)
+        if predicted is None and self.stats is not None and len(self.stats.pv) > 1:
+            predicted = self.stats.pv[1]
+        if predicted in replies:
+            replies.remove(predicted)
+            replies.insert(0, predicted)
+        # pondered searches are not reported as moves
+        telemetry, self.telemetry = self.telemetry, None
+        cache = {}
+        try:
+            for pit in replies:
+                after = board.copy()
+                after.doMove(human, pit)
+                reply_game = Game(after, human_side=human, heuristic=game.heuristic)
+                value, best = self.chooseMove(reply_game, depth, time_budget_ms)
+                if self.stop_check is not None and self.stop_check():
+                    break
+                stats = copy.deepcopy(self.stats) if self.stats is not None else None
+                cache[self._ponderKey(reply_game, depth, time_budget_ms)] = (value, best, self.last_depth, stats)
+        finally:
+            self.telemetry = telemetry
+            self._ponder_cache = cache
+        return len(cache)
+
+    def startPondering(self, depth: int = 6, time_budget_ms: Optional[float] = None, predicted: Optional[str] = None):
+        """Run ponder() on self.game in a background thread until stopPondering() (console play)."""
+        self.stopPondering()
+        stop = threading.Event()
+        outer = self.stop_check
+        self.stop_check = lambda: stop.is_set() or (outer is not None and outer())
+        self._outer_stop_check = outer
+        self._ponder_stop = stop
+        self._ponder_thread = threading.Thread(
+            target=self.ponder, args=(copy.deepcopy(self.game), depth, time_budget_ms, predicted), daemon=True)
+        self._ponder_thread.start()
+
+    def stopPondering(self):
+        """Stop the pondering thread, keeping whatever it finished."""
+        if self._ponder_thread is None:
+            return
+        self._ponder_stop.set()
+        self._ponder_thread.join()
+        self.stop_check = self._outer_stop_check
+        self._ponder_thread = self._ponder_stop = None
+
+    def close(self):
+        """Shut down the worker processes of parallelSearch (or of a parallel MCTS), if any."""
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
+        if self.mcts is not None:
+            self.mcts.close()
+
+    def iterativeDeepening(self, game: Game, time_budget_ms: float, max_depth: int = 64) -> Tuple[float, Optional[str], int]:
+        """
+        Deepen one ply at a time until the budget runs out, the computer has a
+        single legal move, or an iteration reached the end of every line.
+        Returns (value, pit, depth) of the deepest fully completed iteration; each
+        iteration searches the previous principal variation first.
+        """
+        deadline = time.perf_counter() + time_budget_ms / 1000.0
+        forced = len(game.state.possibleMoves(game.playerSide[1])) == 1
+        value, pit, completed = game.evaluate(), None, 1
+        self._pv_line = []
+        self._collect_pv = True
+        try:
+            for depth in range(2, max_depth + 1):
+                # the 1-ply iteration always completes so there is a move to return
+                self._deadline = deadline if depth > 2 else None
+                self._horizon_leaves = 0
+                self._follow_pv = True
+                self._pv_table = [[] for _ in range(depth + 1)]
+                # each iteration's aspiration window is centred on the previous one's score
+                result = self._rootSearch(game, depth, value if completed > 1 else None)
+                if self._stopped:
+                    break
+                (value, pit), completed = result, depth
+                self._pv_line = self._pv_table[0]
+                if pit is None or forced or not self._horizon_leaves or time.perf_counter() >= deadline:
+                    break
+        finally:
+            self._deadline = None
+            self._stopped = False
+            self._collect_pv = False
+            self._follow_pv = False
+        return value, pit, completed
+
     def MinimaxAlphaBetaPruning(self, game: Game, player: int, depth: int, alpha: float, beta: float) -> Tuple[float, Optional[str]]:
+        return self._runSearch(self._minimax, game, player, depth, alpha, beta)
+
+    def NegamaxPVS(self, game: Game, depth: int, alpha: float = -math.inf, beta: float = math.inf) -> Tuple[float, Optional[str]]:
+        """
+        Negamax with principal variation search, for the computer to move.
+        Same (value, pit) as MinimaxAlphaBetaPruning at equal depth; values are
+        from the computer's side as usual.
+        """
+        return self._runSearch(self._negamax, game, 1, depth, alpha, beta)
+
+    def _runSearch(self, search, game: Game, player: int, depth: int, alpha: float, beta: float) -> Tuple[float, Optional[str]]:
+        if self.tt is not None:
+            self.tt.new_search()
+            self._tt_context = context_key(game.playerSide[1], game.heuristic)
+        self.ordering.new_search()
+        self._stopped = False
+        cached = self.eval_cache.evaluator(game.playerSide[1], game.heuristic) if self.eval_cache is not None else None
+        self._evaluate = cached or Game.evaluate
+        if self.stats is None or not self.stats.timers:
+            return search(game, player, depth, alpha, beta, 0)
+        # time move generation and make/unmake through a wrapper, only while measuring
+        board = game.state
+        game.state = TimedBoard(board, self.stats)
+        try:
+            return search(game, player, depth, alpha, beta, 0)
+        finally:
+            game.state = board
+
+    def _timed_evaluate(self, game: Game) -> float:
+        started = time.perf_counter()
+        value = self._evaluate(game)
+        self.stats.evaluate_time += time.perf_counter() - started
+        self.stats.evaluations += 1
+        return value
+
+    def _should_stop(self) -> bool:
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            return True
+        return self.stop_check is not None and self.stop_check()
+
+    def _minimax(self, game: Game, player: int, depth: int, alpha: float, beta: float, ply: int) -> Tuple[float, Optional[str]]:
+        self.nodes += 1
+        if not self.nodes & 255 and self._should_stop():
+            self._stopped = True
+        if self._stopped:
+            return 0, None
+        if self._collect_pv:
+            self._pv_table[ply] = []
+
         if game.gameOver():
-            bestValue = game.evaluate()
+            bestValue = self._evaluate(game)
             return bestValue, None
 
+        side = game.playerSide[player]
+        if self.tablebase is not None and ply > 0:
+            cells = game.state.cells
+            exact = self.tablebase.probe(cells, side)
+            if exact is not None:
+                # perfect play from here: final store difference from the computer's side
+                comp_side = game.playerSide[1]
+                store_diff = cells[STORE_INDEX[comp_side]] - cells[STORE_INDEX[game.playerSide[-1]]]
+                return store_diff + (exact if side == comp_side else -exact), None
+
         if depth == 1:
-            bestValue = game.evaluate()
+            self._horizon_leaves += 1
+            if self.stats is not None and self.stats.timers:
+                return self._timed_evaluate(game), None
+            bestValue = self._evaluate(game)
             return bestValue, None
 
+        moves = game.state.possibleMoves(side)
+        if not moves:
+            return self._evaluate(game), None
+
+        hash_move = None
+        tt = self.tt
+        if tt is not None:
+            key = game.state.zobrist_hash() ^ SIDE_KEYS[side] ^ self._tt_context
+            entry = tt.probe(key)
+            if entry is not None:
+                _, entry_depth, entry_value, entry_flag, entry_move, _ = entry
+                # never cut at the root: the caller needs a move, not just a value
+                if ply > 0 and entry_depth >= depth:
+                    if entry_depth != SOLVED_DEPTH:
+                        self._horizon_leaves += 1
+                    if entry_flag == EXACT:
+                        return entry_value, entry_move
+                    if entry_flag == LOWER and entry_value >= beta:
+                        return entry_value, entry_move
+                    if entry_flag == UPPER and entry_value <= alpha:
+                        return entry_value, entry_move
+                hash_move = entry_move
+            alpha_orig, beta_orig = alpha, beta
+            horizon_before = self._horizon_leaves
+
+        pv_move = None
+        if self._follow_pv:
+            self._follow_pv = False
+            if ply < len(self._pv_line):
+                pv_move = self._pv_line[ply]
+        ordering = self.ordering
+        moves = ordering.order(game.state, side, moves, ply, pv_move, hash_move)
+
         if player == 1:  # MAX (computer)
             bestValue = -math.inf
             bestPit = None
-            comp_side = game.playerSide[1]
-            moves = game.state.possibleMoves(comp_side)
-            if not moves:
-                return game.evaluate(), None
-            for pit in moves:
-                child_game = copy.deepcopy(game)
-                child_game.state.doMove(comp_side, pit)
-                value, _ = self.MinimaxAlphaBetaPruning(child_game, -player, depth - 1, alpha, beta)
+            for index, pit in enumerate(moves):
+                self._follow_pv = pit == pv_move
+                if self.in_place:
+                    undo = game.state.doMove(side, pit, sweep=True)
+                    value, _ = self._minimax(game, -player, depth - 1, alpha, beta, ply + 1)
+                    game.state.undoMove(undo)
+                else:
+                    child_game = copy.deepcopy(game)
+                    child_game.state.doMove(side, pit)
+                    value, _ = self._minimax(child_game, -player, depth - 1, alpha, beta, ply + 1)
+                if self._stopped:
+                    return bestValue, bestPit
                 if value > bestValue:
                     bestValue = value
                     bestPit = pit
+                    if self._collect_pv:
+                        self._pv_table[ply] = [pit] + self._pv_table[ply + 1]
                 if bestValue >= beta:
+                    ordering.record_cutoff(side, pit, ply, depth, index)
                     break
                 if bestValue > alpha:
                     alpha = bestValue
-            return bestValue, bestPit
         else:  # MIN (human)
             bestValue = math.inf
             bestPit = None
-            human_side = game.playerSide[-1]
-            moves = game.state.possibleMoves(human_side)
-            if not moves:
-                return game.evaluate(), None
-            for pit in moves:
-                child_game = copy.deepcopy(game)
-                child_game.state.doMove(human_side, pit)
-                value, _ = self.MinimaxAlphaBetaPruning(child_game, -player, depth - 1, alpha, beta)
+            for index, pit in enumerate(moves):
+                self._follow_pv = pit == pv_move
+                if self.in_place:
+                    undo = game.state.doMove(side, pit, sweep=True)
+                    value, _ = self._minimax(game, -player, depth - 1, alpha, beta, ply + 1)
+                    game.state.undoMove(undo)
+                else:
+                    child_game = copy.deepcopy(game)
+                    child_game.state.doMove(side, pit)
+                    value, _ = self._minimax(child_game, -player, depth - 1, alpha, beta, ply + 1)
+                if self._stopped:
+                    return bestValue, bestPit
                 if value < bestValue:
                     bestValue = value
                     bestPit = pit
+                    if self._collect_pv:
+                        self._pv_table[ply] = [pit] + self._pv_table[ply + 1]
                 if bestValue <= alpha:
+                    ordering.record_cutoff(side, pit, ply, depth, index)
                     break
                 if bestValue < beta:
                     beta = bestValue
-            return bestValue, bestPit
 
-    def computerVsComputer(self, depth1: int = 6, depth2: int = 6, heuristic1: str = "H1", heuristic2: str = "H2", delay: float = 0.5):
+        ordering.record_node(index + 1)
+        if tt is not None:
+            if bestValue <= alpha_orig:
+                flag = UPPER
+            elif bestValue >= beta_orig:
+                flag = LOWER
+            else:
+                flag = EXACT
+            # a subtree searched to the end of the game holds at any depth
+            tt.store(key, depth if self._horizon_leaves != horizon_before else SOLVED_DEPTH, bestValue, flag, bestPit)
+        return bestValue, bestPit
+
+    def _negamax(self, game: Game, color: int, depth: int, alpha: float, beta: float, ply: int) -> Tuple[float, Optional[str]]:
+        """
+        One negamax node: color is 1 when the computer moves, -1 otherwise, and
+        values, alpha and beta are from the point of view of the side to move.
+        The first move gets the full window, the others a zero window
+        (alpha, next float above alpha) and a full re-search only if they beat alpha.
+        The transposition table keeps the computer's point of view, as _minimax does.
+        """
+        self.nodes += 1
+        if not self.nodes & 255 and self._should_stop():
+            self._stopped = True
+        if self._stopped:
+            return 0, None
+        if self._collect_pv:
+            self._pv_table[ply] = []
+
+        if game.gameOver():
+            return color * self._evaluate(game), None
+
+        side = game.playerSide[color]
+        if self.tablebase is not None and ply > 0:
+            cells = game.state.cells
+            exact = self.tablebase.probe(cells, side)
+            if exact is not None:
+                comp_side = game.playerSide[1]
+                store_diff = cells[STORE_INDEX[comp_side]] - cells[STORE_INDEX[game.playerSide[-1]]]
+                return color * store_diff + exact, None
+
+        if depth == 1:
+            self._horizon_leaves += 1
+            if self.stats is not None and self.stats.timers:
+                return color * self._timed_evaluate(game), None
+            return color * self._evaluate(game), None
+
+        moves = game.state.possibleMoves(side)
+        if not moves:
+            return color * self._evaluate(game), None
+
+        hash_move = None
+        tt = self.tt
+        if tt is not None:
+            key = game.state.zobrist_hash() ^ SIDE_KEYS[side] ^ self._tt_context
+            entry = tt.probe(key)
+            if entry is not None:
+                _, entry_depth, entry_value, entry_flag, entry_move, _ = entry
+                if ply > 0 and entry_depth >= depth:
+                    if entry_depth != SOLVED_DEPTH:
+                        self._horizon_leaves += 1
+                    entry_value *= color
+                    if color == -1 and entry_flag != EXACT:
+                        entry_flag = UPPER if entry_flag == LOWER else LOWER
+                    if entry_flag == EXACT:
+                        return entry_value, entry_move
+                    if entry_flag == LOWER and entry_value >= beta:
+                        return entry_value, entry_move
+                    if entry_flag == UPPER and entry_value <= alpha:
+                        return entry_value, entry_move
+                hash_move = entry_move
+        alpha_orig = alpha
+        horizon_before = self._horizon_leaves
+
+        pv_move = None
+        if self._follow_pv:
+            self._follow_pv = False
+            if ply < len(self._pv_line):
+                pv_move = self._pv_line[ply]
+        ordering = self.ordering
+        moves = ordering.order(game.state, side, moves, ply, pv_move, hash_move)
+
+        bestValue = -math.inf
+        bestPit = None
+        for index, pit in enumerate(moves):
+            self._follow_pv = pit == pv_move
+            if self.in_place:
+                child_game = game
+                undo = game.state.doMove(side, pit, sweep=True)
+            else:
+                child_game = copy.deepcopy(game)
+                child_game.state.doMove(side, pit)
+            if index == 0:
+                value = -self._negamax(child_game, -color, depth - 1, -beta, -alpha, ply + 1)[0]
+            else:
+                value = -self._negamax(child_game, -color, depth - 1, -math.nextafter(alpha, math.inf), -alpha, ply + 1)[0]
+                if alpha < value < beta and not self._stopped:
+                    value = -self._negamax(child_game, -color, depth - 1, -beta, -alpha, ply + 1)[0]
+            if self.in_place:
+                game.state.undoMove(undo)
+            if self._stopped:
+                return bestValue, bestPit
+            if value > bestValue:
+                bestValue = value
+                bestPit = pit
+                if self._collect_pv:
+                    self._pv_table[ply] = [pit] + self._pv_table[ply + 1]
+            if bestValue >= beta:
+                ordering.record_cutoff(side, pit, ply, depth, index)
+                break
+            if bestValue > alpha:
+                alpha = bestValue
+
+        ordering.record_node(index + 1)
+        if tt is not None:
+            if bestValue <= alpha_orig:
+                flag = UPPER
+            elif bestValue >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            if color == -1 and flag != EXACT:
+                flag = UPPER if flag == LOWER else LOWER
+            # a subtree searched to the end of the game holds at any depth
+            tt.store(key, depth if self._horizon_leaves != horizon_before else SOLVED_DEPTH,
+                     color * bestValue, flag, bestPit)
+        return bestValue, bestPit
+
+    def computerVsComputer(self, depth1: int = 6, depth2: int = 6, heuristic1: str = "H1", heuristic2: str = "H2", delay: float = 0.5,
+                           time_budget1: Optional[float] = None, time_budget2: Optional[float] = None, recorder=None):
         """
         Run AI vs AI match. 
         - Computer1 (side 1) uses heuristic1
         - Computer2 (side 2) uses heuristic2
+        - time_budget1/time_budget2 (ms) switch that side to iterative deepening
+        - recorder (records.RecordWriter) receives the finished game
         """
         board = self.game.state
+        record = None
+        if recorder is not None:
+            from records import GameRecord, player_settings
+            record = GameRecord.from_board(board, [player_settings(heuristic1, depth1, time_budget1, self.engine),
+                                                   player_settings(heuristic2, depth2, time_budget2, self.engine)],
+                                           source="cvc")
         print(f"\nStarting Computer vs Computer match.")
         print(f"Computer 1 (side 1, A-F): depth={depth1}, heuristic={heuristic1}")
         print(f"Computer 2 (side 2, G-L): depth={depth2}, heuristic={heuristic2}")
@@ -464,21 +1355,35 @@ class Play:
                     print("It's a tie!")
                 else:
                     print(f"Winner: {winner} by {diff} seeds.")
+                if self.tt is not None:
+                    st = self.tt.stats()
+                    print(f"Transposition table: {st['hits']} hits, {st['misses']} misses ({st['hit_rate']:.1%} hit rate)")
+                if self.eval_cache is not None:
+                    st = self.eval_cache.stats()
+                    print(f"Evaluation cache: {st['hits']} hits, {st['misses']} misses ({st['hit_rate']:.1%} hit rate)")
+                if record is not None:
+                    record.finish(board)
+                    recorder.write(record)
                 break
 
             if turn_side == 1:
                 depth = depth1
                 side = 1
                 heuristic = heuristic1
+                time_budget = time_budget1
             else:
                 depth = depth2
                 side = 2
                 heuristic = heuristic2
+                time_budget = time_budget2
 
             other_side = 1 if side == 2 else 2
             temp_board = copy.deepcopy(board)
             temp_game = Game(temp_board, human_side=other_side, heuristic=heuristic)
-            val, pit = self.MinimaxAlphaBetaPruning(temp_game, 1, depth, -math.inf, math.inf)
+            started = time.perf_counter()
+            val, pit = self.chooseMove(temp_game, depth, time_budget)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            depth = self.last_depth
 
             moves = board.possibleMoves(side)
             if not moves:
@@ -490,7 +1395,11 @@ class Play:
                 pit = moves[0]
 
             print(f"\nComputer (side {side}) chooses pit {pit} (value={val:.2f}, depth={depth}, heuristic={heuristic})")
+            if self.stats is not None:
+                print(self.stats.summary())
             board.doMove(side, pit)
+            if record is not None:
+                record.add_move(pit, elapsed_ms)
             print(board)
             time.sleep(delay)
 
@@ -545,6 +1454,7 @@ class Play:
 
 
 def main():
+    from book import load_default_book
     print("Mancala (Awalé) - Menu")
     print("Rules: Capture implemented. Option 1 rules: NO extra turn when landing in store.")
     print("Menu:")
@@ -566,14 +1476,27 @@ def main():
             if hs == '2':
                 human_side = 2
             
-            # Computer uses H1 in Human vs Computer mode
-            play = Play(human_side=human_side, heuristic="H1")
+            # Computer uses H1 in Human vs Computer mode; counters only, the timers would slow the search down
+            play = Play(human_side=human_side, heuristic="H1", book=load_default_book(),
+                        stats=SearchStats(timers=False))
 
+            time_budget = None
             while True:
                 try:
-                    d = input("Enter search depth for computer (3-10 recommended) [default 6]: ").strip()
+                    d = input("Enter search depth for computer (3-10 recommended), a time budget like 200ms, "
+                              "or mcts / mcts 1000ms for Monte Carlo tree search [default 6]: ").strip()
+                    if d.lower().startswith("mcts"):
+                        # Monte Carlo tree search, with its default iteration budget unless a time is given
+                        play.engine = "mcts"
+                        d = d[4:].strip()
                     if d == "":
                         depth = 6
+                    elif d.lower().endswith("ms"):
+                        depth = 6
+                        time_budget = float(d[:-2])
+                        if time_budget <= 0:
+                            print("Enter a positive time budget.")
+                            continue
                     else:
                         depth = int(d)
                         if depth < 1:
@@ -600,11 +1523,14 @@ def main():
                 if turn_side == play.game.playerSide[-1]:
                     print("\nYour turn (Human). Current board:")
                     print(play.game.state)
+                    # search the likely replies while waiting for input
+                    play.startPondering(depth=depth, time_budget_ms=time_budget)
                     play.humanTurn()
+                    play.stopPondering()
                 else:
                     print("\nComputer's turn. Current board:")
                     print(play.game.state)
-                    play.computerTurn(depth=depth)
+                    play.computerTurn(depth=depth, time_budget_ms=time_budget)
 
                 turn_side = 1 if turn_side == 2 else 2
 
@@ -640,9 +1566,16 @@ def main():
                 except:
                     print("Invalid number.")
             
-            # Computer1 uses H1, Computer2 uses H2
-            play = Play(human_side=1, heuristic="H1")
-            play.computerVsComputer(depth1=depth1, depth2=depth2, heuristic1="H1", heuristic2="H2", delay=delay)
+            # Computer1 uses H1, Computer2 uses H2 (its evaluations are cached across the game)
+            from evalcache import EvalCache
+            from records import DEFAULT_RECORD_PATH, RecordWriter
+            play = Play(human_side=1, heuristic="H1", book=load_default_book(), stats=SearchStats(timers=False),
+                        eval_cache=EvalCache())
+            # the finished game is appended to the game records
+            with RecordWriter(DEFAULT_RECORD_PATH) as recorder:
+                play.computerVsComputer(depth1=depth1, depth2=depth2, heuristic1="H1", heuristic2="H2", delay=delay,
+                                        recorder=recorder)
+            print(f"Game saved to {DEFAULT_RECORD_PATH}.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,263 @@
+"""
+Monte Carlo tree search (UCT) engine, an alternative to alpha-beta that needs no heuristic.
+
+    engine = MCTS(iterations=20000)                      # or MCTS(time_budget_ms=1000)
+    value, pit = engine.search(board, side)              # value: expected result for side, 0..1
+    play = Play(engine="mcts", mcts=MCTS(workers=4))     # as the computer player
+
+Every iteration walks down the tree with UCB1, expands one new move, plays
+the game out to the end on the packed form of the position (packed.py) (uniformly random moves, or "greedy" moves that prefer
+captures and store landings) and backs up 1 / 0.5 / 0 for a win / draw / loss.
+The subtree of the position reached after the opponent's reply is kept for
+the next search. With workers > 1, independent trees are grown in several
+processes and their root statistics are added up (root parallelisation).
+"""
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Optional, Tuple
+
+from packed import decode, do_move, encode, game_over, get_score, possible_moves
+
+PLAYOUTS = ("random", "greedy")
+STOP_POLL = 0.005  # seconds between stop checks while worker processes search
+
+# set in worker processes: raised by the parent to stop their searches early
+_stop_flag = None
+
+
+class _Node:
+    __slots__ = ("pit", "parent", "side", "key", "children", "untried", "visits", "reward")
+
+    def __init__(self, pit: Optional[str], parent: Optional["_Node"], side: int, key: int, untried):
+        self.pit = pit          # move that led here
+        self.parent = parent
+        self.side = side        # side to move here
+        self.key = key          # packed position, to find the node again when the tree is reused
+        self.children = []
+        self.untried = untried  # legal moves not expanded yet
+        self.visits = 0
+        self.reward = 0.0       # summed results for the side that played pit
+
+
+def _outcome(key: int) -> float:
+    """1, 0.5 or 0 for Player 1 once the game is over (and swept)."""
+    mine, theirs = get_score(key, 1), get_score(key, 2)
+    return 1.0 if mine > theirs else 0.5 if mine == theirs else 0.0
+
+
+class MCTS:
+    """
+    UCT search. Budgets: iterations and/or time_budget_ms per move (whichever
+    runs out first; a time budget passed to search() overrides time_budget_ms).
+    exploration is the UCB1 constant, playout "random" or "greedy" (greedy
+    plays the move with the largest immediate gain except with probability
+    epsilon). reuse keeps the tree between moves.
+    """
+
+    def __init__(self, iterations: Optional[int] = 10000, time_budget_ms: Optional[float] = None,
+                 exploration: float = 1.4, playout: str = "random", epsilon: float = 0.2,
+                 reuse: bool = True, workers: int = 1, seed: Optional[int] = None):
+        if playout not in PLAYOUTS:
+            raise ValueError(f"Unknown playout {playout!r}, expected one of {', '.join(PLAYOUTS)}.")
+        if iterations is None and time_budget_ms is None:
+            raise ValueError("MCTS needs an iteration or a time budget.")
+        self.iterations = iterations
+        self.time_budget_ms = time_budget_ms
+        self.exploration = exploration
+        self.playout = playout
+        self.epsilon = epsilon
+        self.reuse = reuse
+        self.workers = workers
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._root: Optional[_Node] = None
+        self._pool = None
+        self._stop_flag = None
+        # about the last search
+        self.last_iterations = 0
+        self.last_depth = 0
+        self.reused_visits = 0
+
+    def search(self, board, side: int, time_budget_ms: Optional[float] = None,
+               stop_check: Optional[Callable[[], bool]] = None) -> Tuple[float, Optional[str]]:
+        """(expected result for side in [0, 1], best pit) for side to move on board."""
+        if time_budget_ms is None:
+            time_budget_ms = self.time_budget_ms
+        self.last_iterations = 0
+        self.last_depth = 0
+        key = encode(board)
+        if game_over(key):
+            return 0.5, None
+        if self.workers > 1:
+            return self._parallel_search(key, side, time_budget_ms, stop_check)
+        root = self._grow(key, side, time_budget_ms, stop_check)
+        best = max(root.children, key=lambda child: child.visits)
+        return best.reward / best.visits, best.pit
+
+    def root_statistics(self) -> Dict[str, Tuple[int, float]]:
+        """pit -> (visits, summed reward) of the root's children after the last search."""
+        if self._root is None:
+            return {}
+        return {child.pit: (child.visits, child.reward) for child in self._root.children}
+
+    def _find_root(self, key: int, side: int) -> Optional[_Node]:
+        """The node for this position in the previous tree: the old root, or two plies below it at most."""
+        old = self._root
+        if old is None:
+            return None
+        frontier = [old]
+        for _ in range(3):
+            next_frontier = []
+            for node in frontier:
+                if node.key == key and node.side == side:
+                    return node
+                next_frontier.extend(node.children)
+            frontier = next_frontier
+        return None
+
+    def _grow(self, key: int, side: int, time_budget_ms: Optional[float],
+              stop_check: Optional[Callable[[], bool]]) -> _Node:
+        root = self._find_root(key, side) if self.reuse else None
+        if root is None:
+            root = _Node(None, None, side, key, possible_moves(key, side))
+        root.parent = None
+        self._root = root
+        self.reused_visits = root.visits
+
+        deadline = time.perf_counter() + time_budget_ms / 1000.0 if time_budget_ms is not None else None
+        limit = self.iterations
+        rng = self._rng
+        log, sqrt = math.log, math.sqrt
+        c = self.exploration
+        done = 0
+        max_depth = 0
+        while limit is None or done < limit:
+            if not done & 63 and done and (
+                    (deadline is not None and time.perf_counter() >= deadline)
+                    or (stop_check is not None and stop_check())):
+                break
+            node = root
+            depth = 0
+            # selection
+            while not node.untried and node.children:
+                log_n = log(node.visits)
+                best = None
+                best_score = -1.0
+                for child in node.children:
+                    score = child.reward / child.visits + c * sqrt(log_n / child.visits)
+                    if score > best_score:
+                        best, best_score = child, score
+                node = best
+                depth += 1
+            # expansion
+            if node.untried:
+                pit = node.untried.pop(rng.randrange(len(node.untried)))
+                other = 2 if node.side == 1 else 1
+                state = do_move(node.key, node.side, pit)
+                untried = [] if game_over(state) else possible_moves(state, other)
+                child = _Node(pit, node, other, state, untried)
+                node.children.append(child)
+                node = child
+                depth += 1
+            if depth > max_depth:
+                max_depth = depth
+            # simulation, then backpropagation from the side that moved into each node
+            result_for_1 = self._playout(node.key, node.side)
+            while node is not None:
+                node.visits += 1
+                if node.parent is not None:
+                    node.reward += result_for_1 if node.parent.side == 1 else 1.0 - result_for_1
+                node = node.parent
+            done += 1
+        self.last_iterations = done
+        self.last_depth = max_depth
+        return root
+
+    def _playout(self, key: int, side: int) -> float:
+        """Play the packed position out to the end; result for Player 1."""
+        rng = self._rng
+        greedy = self.playout == "greedy"
+        epsilon = self.epsilon
+        while not game_over(key):
+            moves = possible_moves(key, side)
+            if greedy and rng.random() >= epsilon:
+                # the move that puts the most seeds in its own store at once (capture or store landing)
+                store = get_score(key, side)
+                best_gain = -1
+                for pit in moves:
+                    after = do_move(key, side, pit)
+                    gain = get_score(after, side) - store + rng.random() * 0.5
+                    if gain > best_gain:
+                        best_gain, next_key = gain, after
+                key = next_key
+            else:
+                key = do_move(key, side, moves[rng.randrange(len(moves))])
+            side = 2 if side == 1 else 1
+        return _outcome(key)
+
+    def _parallel_search(self, key: int, side: int, time_budget_ms: Optional[float],
+                         stop_check: Optional[Callable[[], bool]]) -> Tuple[float, Optional[str]]:
+        if self._pool is None:
+            # the flag is inherited by the workers, it cannot be sent with each job
+            self._stop_flag = multiprocessing.Value('b', 0, lock=False)
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self._stop_flag,))
+        self._stop_flag.value = 0
+        options = {
+            "iterations": self.iterations, "time_budget_ms": time_budget_ms,
+            "exploration": self.exploration, "playout": self.playout, "epsilon": self.epsilon,
+        }
+        seed = self._rng.randrange(1 << 30)
+        futures = [self._pool.submit(_worker_search, key, side, options, seed + k)
+                   for k in range(self.workers)]
+        if stop_check is not None:
+            # the workers stop within 64 iterations of the flag; their partial trees still count
+            while wait(futures, timeout=STOP_POLL, return_when=FIRST_EXCEPTION).not_done:
+                if stop_check():
+                    self._stop_flag.value = 1
+                    break
+        totals: Dict[str, list] = {}
+        iterations = 0
+        for future in futures:
+            stats, done, depth = future.result()
+            iterations += done
+            self.last_depth = max(self.last_depth, depth)
+            for pit, (visits, reward) in stats.items():
+                entry = totals.setdefault(pit, [0, 0.0])
+                entry[0] += visits
+                entry[1] += reward
+        self.last_iterations = iterations
+        pit, (visits, reward) = max(totals.items(), key=lambda item: item[1][0])
+        return reward / visits, pit
+
+    def reset(self):
+        """Forget the tree (e.g. before a new game)."""
+        self._root = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __getstate__(self):
+        # sent to worker processes without its tree or process pool
+        state = self.__dict__.copy()
+        state["_root"] = None
+        state["_pool"] = None
+        state["_stop_flag"] = None
+        return state
+
+
+def _init_worker(stop_flag):
+    global _stop_flag
+    _stop_flag = stop_flag
+
+
+def _worker_search(key: int, side: int, options: dict, seed: int):
+    """One independent tree in a worker process; returns its root statistics."""
+    engine = MCTS(reuse=False, seed=seed, **options)
+    engine.search(decode(key), side, stop_check=lambda: _stop_flag.value)
+    return engine.root_statistics(), engine.last_iterations, engine.last_depth
@@ -0,0 +1,123 @@
+from typing import List, Optional
+
+
+class MoveOrdering:
+    """
+    Decides in which order alpha-beta expands the moves of a node.
+
+    Each source can be switched on or off:
+    - pv:      the previous iteration's principal variation move and the
+               transposition table's best move go first
+    - killers: moves that caused a cutoff at the same ply in a sibling node
+    - history: moves that caused cutoffs anywhere, weighted by depth^2
+    - static:  captures first (largest first), then moves ending in the own store
+
+    The counters measure how well the ordering works: a good ordering makes
+    most cutoffs happen on the first move and keeps the branching factor low.
+    """
+
+    CAPTURE_SCORE = 1 << 20
+    STORE_SCORE = 1 << 19
+    KILLER_SCORE = 1 << 21
+    HASH_SCORE = 1 << 22
+    PV_SCORE = 1 << 23
+
+    def __init__(self, pv: bool = True, killers: bool = True, history: bool = True, static: bool = True,
+                 max_ply: int = 128):
+        self.use_pv = pv
+        self.use_killers = killers
+        self.use_history = history
+        self.use_static = static
+        self.max_ply = max_ply
+        self.killers = [[None, None] for _ in range(max_ply)]
+        # history[side][pit]
+        self.history = [None, {}, {}]
+        self.reset_counters()
+
+    @classmethod
+    def none(cls) -> "MoveOrdering":
+        """Plain A-F / G-L order, counters only."""
+        return cls(pv=False, killers=False, history=False, static=False)
+
+    @classmethod
+    def pv_only(cls) -> "MoveOrdering":
+        return cls(pv=True, killers=False, history=False, static=False)
+
+    def reset_counters(self):
+        self.nodes = 0
+        self.children = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def new_search(self):
+        # keep history as a hint from the previous move, but let fresh cutoffs dominate
+        for side in (1, 2):
+            table = self.history[side]
+            for pit in table:
+                table[pit] >>= 1
+
+    def order(self, board, side: int, moves: List[str], ply: int,
+              pv_move: Optional[str] = None, hash_move: Optional[str] = None) -> List[str]:
+        if len(moves) < 2:
+            return moves
+        use_killers = self.use_killers and ply < self.max_ply
+        if not (self.use_static or self.use_history or use_killers):
+            # cheap path: only move the PV / hash move to the front
+            if self.use_pv:
+                for first in (hash_move, pv_move):
+                    if first is not None and first in moves and first != moves[0]:
+                        moves.remove(first)
+                        moves.insert(0, first)
+            return moves
+
+        killers = self.killers[ply] if use_killers else ()
+        history = self.history[side]
+        own_store = 'S1' if side == 1 else 'S2'
+        scores = {}
+        for pit in moves:
+            score = 0
+            if self.use_pv:
+                if pit == pv_move:
+                    score += self.PV_SCORE
+                elif pit == hash_move:
+                    score += self.HASH_SCORE
+            if pit in killers:
+                score += self.KILLER_SCORE
+            if self.use_static:
+                landing, captured = board.preview(side, pit)
+                if captured:
+                    score += self.CAPTURE_SCORE + captured
+                elif landing == own_store:
+                    score += self.STORE_SCORE
+            if self.use_history:
+                score += min(history.get(pit, 0), self.STORE_SCORE - 1)
+            scores[pit] = score
+        # stable sort keeps the A-F / G-L order between equal scores
+        moves.sort(key=scores.__getitem__, reverse=True)
+        return moves
+
+    def record_node(self, children_searched: int):
+        self.nodes += 1
+        self.children += children_searched
+
+    def record_cutoff(self, side: int, pit: str, ply: int, depth: int, index: int):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        if self.use_killers and ply < self.max_ply:
+            slot = self.killers[ply]
+            if slot[0] != pit:
+                slot[1] = slot[0]
+                slot[0] = pit
+        if self.use_history:
+            table = self.history[side]
+            table[pit] = table.get(pit, 0) + depth * depth
+
+    def stats(self) -> dict:
+        return {
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+            # average number of children actually searched per interior node
+            "effective_branching_factor": self.children / self.nodes if self.nodes else 0.0,
+        }
@@ -0,0 +1,119 @@
+"""
+Packed positions: the 14 cells of a board (FastMancalaBoard layout, one byte
+per cell, A first) as a 14-byte bytes object or as one int with cell i in bits
+8*i .. 8*i+7.
+
+    key = encode(board)              # int, hashable, ~40 bytes in memory
+    board = decode(key)              # FastMancalaBoard (or decode(key, MancalaBoard))
+    key = do_move(key, 1, "C")       # play on the packed form directly
+
+Each cell must hold at most 255 seeds (the Zobrist tables have the same limit).
+"""
+from typing import List, Union
+
+from mancala import (
+    CELL_INDEX, CELL_NAMES, FastMancalaBoard, LANDING, OPPOSITE_INDEX, PIT_INDICES, SOW_CYCLE, SOW_CYCLE_LEN,
+    SOW_PATH, STORE_INDEX,
+)
+
+PACKED_SIZE = 14
+MAX_SEEDS = 255
+SHIFT = tuple(8 * i for i in range(14))
+# all six pits of a side set to 0xFF: key & PIT_MASK[side] == 0 means the side is empty
+PIT_MASK = (None,) + tuple(sum(0xFF << SHIFT[i] for i in PIT_INDICES[side]) for side in (1, 2))
+# one seed in each cell of a full lap, and in each cell of a partial path, as packed increments
+LAP_ADD = (None,) + tuple(sum(1 << SHIFT[c] for c in SOW_CYCLE[side]) for side in (1, 2))
+PATH_ADD = (None,) + tuple(
+    tuple(tuple(sum(1 << SHIFT[c] for c in SOW_PATH[side][i][r]) for r in range(SOW_CYCLE_LEN))
+          if i in PIT_INDICES[side] else None for i in range(14))
+    for side in (1, 2)
+)
+_SIDE_PITS = (None,) + tuple(tuple((CELL_NAMES[i], SHIFT[i]) for i in PIT_INDICES[side]) for side in (1, 2))
+
+
+def pack_cells(cells) -> int:
+    return int.from_bytes(bytes(cells), "little")
+
+
+def unpack_cells(key: int) -> List[int]:
+    return list(key.to_bytes(PACKED_SIZE, "little"))
+
+
+def encode(board) -> int:
+    """Packed int of a MancalaBoard or FastMancalaBoard."""
+    return int.from_bytes(bytes(board.cells), "little")
+
+
+def encode_bytes(board) -> bytes:
+    """The 14 cells of a board as 14 bytes."""
+    return bytes(board.cells)
+
+
+def decode(packed: Union[int, bytes], board_class=FastMancalaBoard):
+    """A new board of board_class from a packed int or 14-byte string."""
+    if isinstance(packed, int):
+        packed = packed.to_bytes(PACKED_SIZE, "little")
+    return board_class.from_cells(list(packed))
+
+
+def cell(key: int, name: str) -> int:
+    return (key >> SHIFT[CELL_INDEX[name]]) & 0xFF
+
+
+def possible_moves(key: int, player_side: int) -> List[str]:
+    return [name for name, shift in _SIDE_PITS[player_side] if (key >> shift) & 0xFF]
+
+
+def side_pits_empty(key: int, player_side: int) -> bool:
+    return not key & PIT_MASK[player_side]
+
+
+def game_over(key: int) -> bool:
+    return not key & PIT_MASK[1] or not key & PIT_MASK[2]
+
+
+def get_score(key: int, player_side: int) -> int:
+    return (key >> SHIFT[STORE_INDEX[player_side]]) & 0xFF
+
+
+def sweep(key: int) -> int:
+    """Once one side is empty, move the other side's pits into its store (as collect_remaining_to_store)."""
+    if not key & PIT_MASK[1]:
+        side = 2
+    elif not key & PIT_MASK[2]:
+        side = 1
+    else:
+        return key
+    total = 0
+    for i in PIT_INDICES[side]:
+        total += (key >> SHIFT[i]) & 0xFF
+    return (key & ~PIT_MASK[side]) + (total << SHIFT[STORE_INDEX[side]])
+
+
+def do_move(key: int, player_side: int, pit: str, sweep_end: bool = True) -> int:
+    """
+    The packed position after player_side plays pit, with the rules of
+    FastMancalaBoard.doMove: sowing is a single addition of precomputed lap
+    and path increments, followed by the capture rule and (by default) the
+    end-of-game sweep.
+    """
+    i = CELL_INDEX[pit]
+    shift = SHIFT[i]
+    seeds = (key >> shift) & 0xFF
+    if seeds == 0:
+        raise ValueError(f"Cannot play empty pit {pit}.")
+    laps, rest = divmod(seeds, SOW_CYCLE_LEN)
+    key += PATH_ADD[player_side][i][rest] - (seeds << shift)
+    if laps:
+        key += laps * LAP_ADD[player_side]
+
+    # Capture rule: last seed in an empty pit on the player's own side
+    last = LANDING[player_side][i][rest]
+    if last in PIT_INDICES[player_side] and (key >> SHIFT[last]) & 0xFF == 1:
+        opposite_shift = SHIFT[OPPOSITE_INDEX[last]]
+        opposite_count = (key >> opposite_shift) & 0xFF
+        key += (((opposite_count + 1) << SHIFT[STORE_INDEX[player_side]])
+                - (opposite_count << opposite_shift) - (1 << SHIFT[last]))
+    if sweep_end:
+        key = sweep(key)
+    return key
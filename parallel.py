@@ -0,0 +1,108 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Tuple
+
+# Worker-side state, set once per process by _init_worker
+_shared_alpha = None
+_worker_play = None
+
+
+def _init_worker(shared_alpha, play_options: dict):
+    global _shared_alpha, _worker_play
+    from mancala import Play
+    _shared_alpha = shared_alpha
+    play_options = dict(play_options)
+    tablebase_path = play_options.pop("tablebase_path", None)
+    if tablebase_path is not None:
+        from tablebase import Tablebase
+        play_options["tablebase"] = Tablebase(tablebase_path)
+    _worker_play = Play(**play_options)
+
+
+def _search_root_move(game, index: int, pit: str, depth: int) -> Tuple[int, float, bool]:
+    """
+    Search one root move of game (computer to move) and report (index, value, exact).
+    The window opens just below the best value found so far by any worker, so a move
+    that ties the best is still searched exactly and ties can be broken like the serial search.
+    """
+    game.state.doMove(game.playerSide[1], pit, sweep=True)
+    alpha = math.nextafter(_shared_alpha.value, -math.inf)
+    value, _ = _worker_play.MinimaxAlphaBetaPruning(game, -1, depth - 1, alpha, math.inf)
+    exact = value > alpha
+    if exact:
+        with _shared_alpha.get_lock():
+            if value > _shared_alpha.value:
+                _shared_alpha.value = value
+    return index, value, exact
+
+
+class ParallelSearch:
+    """
+    Root-parallel alpha-beta over a process pool.
+
+    The first root move is searched alone to get a good bound, then the other
+    root moves are spread over the workers. The best value so far is shared
+    through a multiprocessing.Value that every worker reads before it starts.
+    The result is exactly what a serial MinimaxAlphaBetaPruning returns when it
+    expands the root moves in the same order: the earliest move with the best value.
+    """
+
+    def __init__(self, workers: Optional[int] = None, play_options: Optional[dict] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.play_options = dict(play_options or {})
+        self._shared_alpha = multiprocessing.Value('d', -math.inf)
+        self._pool = None
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._shared_alpha, self.play_options),
+            )
+        return self._pool
+
+    def search(self, game, depth: int, moves=None) -> Tuple[float, Optional[str]]:
+        """
+        Search game for its computer side to the given depth.
+        moves optionally fixes the root move order (defaults to possibleMoves order).
+        Finished positions and depth <= 1 are left to the caller (serial search).
+        """
+        if moves is None:
+            moves = game.state.possibleMoves(game.playerSide[1])
+        if not moves:
+            return game.evaluate(), None
+        pool = self._ensure_pool()
+        self._shared_alpha.value = -math.inf
+
+        results = {}
+        first = pool.submit(_search_root_move, game, 0, moves[0], depth)
+        index, value, exact = first.result()
+        results[index] = (value, exact)
+
+        pending = {pool.submit(_search_root_move, game, i, pit, depth) for i, pit in enumerate(moves) if i > 0}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, value, exact = future.result()
+                results[index] = (value, exact)
+
+        best_value = max(value for value, exact in results.values() if exact)
+        for i in range(len(moves)):
+            value, exact = results[i]
+            if exact and value == best_value:
+                return value, moves[i]
+        return best_value, None  # unreachable: the best value always comes from an exact result
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,331 @@
+"""
+Game records: an append-only log of finished games, streamed back lazily.
+
+    python records.py summary games.jsonl
+    python records.py analyse games.jsonl --depth 10 --out analysis.jsonl --workers 8
+
+One game per line, as compact JSON:
+
+    {"v": 1, "seeds": 4, "moves": "CHBKD...", "ms": [12.5, 40.1, ...], "score": [27, 21],
+     "players": [{"heuristic": "H1", "depth": 6}, {"heuristic": "H2", "depth": 8}],
+     "source": "cvc", "time": 1760000000.0}
+
+Moves are pit letters, players alternating with Player 1 first; "ms" is the
+time each move took. Positions that are not a standard start are stored as
+"start" (the 14 cells in CELL_NAMES order) instead of "seeds". A path ending
+in .gz is written and read gzip-compressed; each batch is then its own gzip
+member, which gzip readers concatenate transparently.
+
+Nothing here holds more than one batch of games in memory: RecordWriter
+buffers batch_size records, iter_records() reads line by line, and analyse()
+feeds the worker pool a bounded window of games at a time.
+"""
+import argparse
+import gzip
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from mancala import FastMancalaBoard, Game, MancalaBoard, Play
+
+DEFAULT_RECORD_PATH = "games.jsonl"
+VERSION = 1
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def player_settings(heuristic: Optional[str] = None, depth: Optional[int] = None,
+                    time_budget_ms: Optional[float] = None, engine: Optional[str] = None,
+                    human: bool = False) -> dict:
+    """Settings of one side for GameRecord(players=...); unset fields are left out."""
+    if human:
+        return {"human": True}
+    settings = {"heuristic": heuristic, "depth": depth, "time_budget_ms": time_budget_ms}
+    if engine not in (None, "minimax"):
+        settings["engine"] = engine
+    return {k: v for k, v in settings.items() if v is not None}
+
+
+class GameRecord:
+    """
+    One game: start position, settings of both sides, moves and move times.
+
+        record = GameRecord([player_settings("H1", 6), player_settings("H2", 6)], source="cvc")
+        record.add_move("C", 12.5)
+        ...
+        record.finish(board)   # final score, once the game is over
+    """
+
+    def __init__(self, players: List[dict], seeds_per_pit: int = 4, start: Optional[List[int]] = None,
+                 source: Optional[str] = None):
+        self.players = players
+        self.seeds_per_pit = seeds_per_pit
+        self.start = list(start) if start is not None else None
+        self.source = source
+        self.time = time.time()
+        self.moves = ""
+        self.ms: List[float] = []
+        self.score: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def from_board(cls, board, players: List[dict], source: Optional[str] = None) -> "GameRecord":
+        """A record of a game starting from board (any position, not only a fresh board)."""
+        cells = board.cells
+        seeds = cells[0]
+        if cells == FastMancalaBoard(seeds).cells:
+            return cls(players, seeds, source=source)
+        return cls(players, start=cells, source=source)
+
+    def add_move(self, pit: str, ms: float):
+        self.moves += pit
+        self.ms.append(round(ms, 1))
+
+    def finish(self, board):
+        self.score = (board.get_score(1), board.get_score(2))
+
+    def board(self, board_class=MancalaBoard):
+        """The start position as a new board_class."""
+        if self.start is not None:
+            return board_class.from_cells(self.start)
+        return board_class(self.seeds_per_pit)
+
+    def to_dict(self) -> dict:
+        record = {"v": VERSION}
+        if self.start is not None:
+            record["start"] = self.start
+        else:
+            record["seeds"] = self.seeds_per_pit
+        record.update(moves=self.moves, ms=self.ms, score=list(self.score) if self.score else None,
+                      players=self.players, source=self.source, time=round(self.time, 3))
+        return record
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameRecord":
+        if data.get("v") != VERSION:
+            raise ValueError(f"Unsupported game record version {data.get('v')!r}.")
+        record = cls(data["players"], data.get("seeds", 4), data.get("start"), data.get("source"))
+        record.time = data.get("time", 0.0)
+        record.moves = data["moves"]
+        record.ms = data.get("ms", [])
+        record.score = tuple(data["score"]) if data.get("score") else None
+        return record
+
+
+class RecordWriter:
+    """
+    Appends GameRecords to path, batch_size games per write. Always close()
+    (or use as a context manager) so the last partial batch is written.
+
+        with RecordWriter("games.jsonl.gz", batch_size=1000) as out:
+            out.write(record)
+    """
+
+    def __init__(self, path: str = DEFAULT_RECORD_PATH, batch_size: int = 100):
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1.")
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self._pending: List[str] = []
+
+    def write(self, record):
+        """Queue one GameRecord (or an already serialised dict) for the next batch."""
+        data = record.to_dict() if isinstance(record, GameRecord) else record
+        self._pending.append(json.dumps(data, separators=(",", ":")) + "\n")
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        # one open and one write per batch; a crash loses at most the batch in memory
+        with _open(self.path, "a") as f:
+            f.write("".join(self._pending))
+        self.written += len(self._pending)
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_records(path: str) -> Iterator[GameRecord]:
+    """The records in path, one at a time; blank lines are skipped."""
+    with _open(path, "r") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield GameRecord.from_dict(json.loads(line))
+            except (ValueError, KeyError) as exc:
+                raise ValueError(f"{path}:{line_no}: bad game record ({exc}).") from exc
+
+
+def replay(record: GameRecord, board_class=MancalaBoard, copy: bool = True) -> Iterator[Tuple[object, Optional[int], Optional[str]]]:
+    """
+    Yield (board, side, pit) for every position of the game: side is to move
+    and plays pit from board. The last item is the final position (after the
+    end-of-game sweep) with side and pit None. With copy=False the same board
+    is yielded each time, updated in place, which is cheaper when each
+    position is only looked at before the next one is requested.
+    """
+    board = record.board(board_class)
+    side = 1
+    for ply, pit in enumerate(record.moves, 1):
+        if board.side_pits_empty(1) or board.side_pits_empty(2):
+            raise ValueError(f"Move {ply} ({pit}) played after the end of the game.")
+        if pit not in board.possibleMoves(side):
+            raise ValueError(f"Illegal move {ply}: side {side} cannot play {pit}.")
+        yield (board.copy() if copy else board), side, pit
+        board.doMove(side, pit)
+        # as Game.gameOver(): the remaining seeds go to their owner once a side is empty
+        if board.side_pits_empty(1) or board.side_pits_empty(2):
+            board.collect_remaining_to_store()
+        side = 2 if side == 1 else 1
+    yield (board.copy() if copy else board), None, None
+
+
+# one engine per worker process; no transposition table, so a game's analysis
+# does not depend on which games the worker analysed before
+_engine = None
+
+
+def analyse_game(job) -> dict:
+    """
+    Re-score every move of one game. job = (index, record dict, depth, heuristic).
+    For each position, "best"/"value" is the search's choice and value for
+    the side to move, and "played" the value of the move actually played at the
+    same depth, both from the mover's side; "loss" is value - played (>= 0).
+    """
+    global _engine
+    if _engine is None:
+        _engine = Play()
+    index, data, depth, heuristic = job
+    record = GameRecord.from_dict(data)
+    best, values, played = [], [], []
+    for board, side, pit in replay(record, FastMancalaBoard, copy=False):
+        if pit is None:
+            break
+        other_side = 2 if side == 1 else 1
+        value, best_pit = _engine.chooseMove(Game(board.copy(), human_side=other_side, heuristic=heuristic), depth)
+        if best_pit == pit:
+            played_value = value
+        else:
+            # the played move searched one ply shallower, with the opponent to move
+            after = board.copy()
+            after.doMove(side, pit)
+            played_value, _ = _engine.MinimaxAlphaBetaPruning(
+                Game(after, human_side=other_side, heuristic=heuristic), -1, depth - 1, -math.inf, math.inf)
+        best.append(best_pit)
+        values.append(round(value, 3))
+        played.append(round(played_value, 3))
+    return {
+        "game": index,
+        "depth": depth,
+        "heuristic": heuristic,
+        "best": "".join(p or "-" for p in best),
+        "value": values,
+        "played": played,
+        "loss": [round(v - p, 3) for v, p in zip(values, played)],
+    }
+
+
+def _windows(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    while True:
+        window = list(itertools.islice(items, size))
+        if not window:
+            return
+        yield window
+
+
+def analyse(path: str, out_path: str, depth: int = 8, heuristic: str = "H2", workers: Optional[int] = None,
+            chunksize: int = 4, limit: Optional[int] = None) -> Tuple[int, float]:
+    """
+    Re-analyse the games in path at depth across worker processes and append one
+    result line per game (analyse_game) to out_path, in input order. Returns
+    (games analysed, seconds).
+    """
+    if depth < 2:
+        raise ValueError("Analysis depth must be >= 2.")
+    workers = workers or os.cpu_count()
+    jobs = ((i, record.to_dict(), depth, heuristic) for i, record in enumerate(iter_records(path)))
+    if limit is not None:
+        jobs = itertools.islice(jobs, limit)
+    started = time.perf_counter()
+    finished = 0
+    with RecordWriter(out_path, batch_size=100) as out, multiprocessing.Pool(workers) as pool:
+        # Pool.imap would read the whole input ahead of the workers; feed it a
+        # bounded window of games at a time instead
+        for window in _windows(jobs, workers * chunksize * 8):
+            for result in pool.imap(analyse_game, window, chunksize=chunksize):
+                out.write(result)
+                finished += 1
+    return finished, time.perf_counter() - started
+
+
+def summarize(path: str) -> List[str]:
+    """Games, plies and results per pair of player settings, in one pass over path."""
+    def label(settings: dict) -> str:
+        if settings.get("human"):
+            return "human"
+        name = settings.get("engine", settings.get("heuristic", "?")).upper()
+        if settings.get("time_budget_ms") is not None:
+            return f"{name}:{settings['time_budget_ms']:g}ms"
+        return f"{name}:{settings.get('depth', '?')}"
+
+    tally = {}
+    games = plies = 0
+    for record in iter_records(path):
+        games += 1
+        plies += len(record.moves)
+        key = tuple(label(p) for p in record.players)
+        counts = tally.setdefault(key, [0, 0, 0, 0])  # P1 wins, draws, P2 wins, unfinished
+        if record.score is None:
+            counts[3] += 1
+        else:
+            s1, s2 = record.score
+            counts[0 if s1 > s2 else 1 if s1 == s2 else 2] += 1
+    lines = [f"{p1:>12} vs {p2:<12} P1 {w}  draw {d}  P2 {l}" + (f"  unfinished {u}" if u else "")
+             for (p1, p2), (w, d, l, u) in sorted(tally.items())]
+    lines.append(f"{games} games, {plies} moves ({plies / games if games else 0:.1f} per game)")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mancala game records: summary and re-analysis.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary = commands.add_parser("summary", help="results per pairing")
+    summary.add_argument("path", nargs="?", default=DEFAULT_RECORD_PATH)
+    analysis = commands.add_parser("analyse", help="re-score every move with a deeper search")
+    analysis.add_argument("path", nargs="?", default=DEFAULT_RECORD_PATH)
+    analysis.add_argument("--out", default="analysis.jsonl", help="one JSON line per game (appended)")
+    analysis.add_argument("--depth", type=int, default=8)
+    analysis.add_argument("--heuristic", choices=("H1", "H2"), default="H2")
+    analysis.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    analysis.add_argument("--limit", type=int, default=None, help="analyse only the first N games")
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        for line in summarize(args.path):
+            print(line)
+    else:
+        games, seconds = analyse(args.path, args.out, args.depth, args.heuristic, args.workers, limit=args.limit)
+        print(f"{games} games analysed in {seconds:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
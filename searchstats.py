@@ -0,0 +1,164 @@
+import copy
+import json
+import time
+from typing import List, Optional
+
+
+class SearchStats:
+    """
+    What the last Play.chooseMove did: nodes, cutoffs, effective branching
+    factor, where the time went (leaf evaluations, move generation, making and
+    unmaking moves) and the principal variation.
+
+    Play fills it in when it is given one (Play(stats=SearchStats())); without
+    it the search runs exactly as before. The timers wrap the board in a
+    TimedBoard for the duration of the search and slow it down noticeably;
+    SearchStats(timers=False) keeps only the counters, the PV and the speed.
+    """
+
+    def __init__(self, timers: bool = True):
+        self.timers = timers
+        self.reset()
+
+    def reset(self):
+        self.nodes = 0
+        self.interior_nodes = 0
+        self.children = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.evaluations = 0
+        self.evaluate_time = 0.0
+        self.movegen_time = 0.0
+        self.move_time = 0.0
+        self.elapsed = 0.0
+        self.depth = None
+        self.value = None
+        self.move = None
+        self.pv: List[str] = []
+        # "search", "book", "parallel" (root-parallel nodes are counted in the workers)
+        # or "mcts" (nodes are playouts)
+        self.source = "search"
+        # True when the result was searched ahead while the human was thinking (Play.ponder)
+        self.pondered = False
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def effective_branching_factor(self) -> float:
+        """Average number of children searched per interior node."""
+        return self.children / self.interior_nodes if self.interior_nodes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "pondered": self.pondered,
+            "depth": self.depth,
+            "value": self.value,
+            "move": self.move,
+            "pv": list(self.pv),
+            "nodes": self.nodes,
+            "elapsed": round(self.elapsed, 6),
+            "nps": round(self.nps),
+            "cutoffs": self.cutoffs,
+            "first_move_cutoff_rate": round(self.first_move_cutoff_rate, 4),
+            "effective_branching_factor": round(self.effective_branching_factor, 4),
+            "evaluations": self.evaluations,
+            "evaluate_time": round(self.evaluate_time, 6),
+            "movegen_time": round(self.movegen_time, 6),
+            "move_time": round(self.move_time, 6),
+        }
+
+    def summary(self) -> str:
+        if self.pondered:
+            return "Ponder hit | " + self._summary()
+        return self._summary()
+
+    def _summary(self) -> str:
+        if self.source == "book":
+            return f"Book move, PV: {' '.join(self.pv) or '-'}"
+        if self.source == "mcts":
+            return (f"{self.nodes} playouts in {self.elapsed * 1000:.0f} ms ({self.nps / 1000:.1f}k/s), "
+                    f"tree depth {self.depth}, expected result {self.value:.2f}")
+        line = (f"{self.nodes} nodes in {self.elapsed * 1000:.0f} ms ({self.nps / 1000:.0f}k nps), "
+                f"EBF {self.effective_branching_factor:.2f}, {self.cutoffs} cutoffs")
+        if self.timers and self.elapsed:
+            line += (f" | evaluate {self.evaluate_time / self.elapsed:.0%}, "
+                     f"movegen {self.movegen_time / self.elapsed:.0%}, "
+                     f"make/unmake {self.move_time / self.elapsed:.0%}")
+        return line + f" | PV: {' '.join(self.pv) or '-'}"
+
+
+class TimedBoard:
+    """
+    Stands in for a board during an instrumented search, adding the time spent
+    in possibleMoves and doMove/undoMove (or copying) to a SearchStats.
+    Everything else is forwarded to the wrapped board.
+    """
+
+    def __init__(self, board, stats: SearchStats):
+        self.board_engine = board
+        self.stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self.board_engine, name)
+
+    def possibleMoves(self, player_side: int):
+        started = time.perf_counter()
+        moves = self.board_engine.possibleMoves(player_side)
+        self.stats.movegen_time += time.perf_counter() - started
+        return moves
+
+    def doMove(self, player_side: int, pit: str, sweep: bool = False):
+        started = time.perf_counter()
+        undo = self.board_engine.doMove(player_side, pit, sweep)
+        self.stats.move_time += time.perf_counter() - started
+        return undo
+
+    def undoMove(self, undo):
+        started = time.perf_counter()
+        self.board_engine.undoMove(undo)
+        self.stats.move_time += time.perf_counter() - started
+
+    def __deepcopy__(self, memo):
+        # copy the board, keep reporting to the same stats
+        started = time.perf_counter()
+        board = copy.deepcopy(self.board_engine, memo)
+        self.stats.move_time += time.perf_counter() - started
+        return TimedBoard(board, self.stats)
+
+
+class JsonLinesLog:
+    """
+    Telemetry hook for Play(telemetry=...): appends one JSON object per searched move.
+
+        play = Play(telemetry=JsonLinesLog("search.jsonl"))
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a")
+
+    def __call__(self, record: dict):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def telemetry_record(stats: SearchStats, side: int, heuristic: str, time_budget_ms: Optional[float] = None) -> dict:
+    record = {"time": time.time(), "side": side, "heuristic": heuristic, "time_budget_ms": time_budget_ms}
+    record.update(stats.to_dict())
+    return record
@@ -0,0 +1,370 @@
+"""
+Headless engine server: one long-running process with warm search workers,
+serving moves to any number of games over a JSON-lines protocol.
+
+    python server.py                                # stdin/stdout
+    python server.py --tcp 127.0.0.1:7654 --workers 4
+    python server.py --unix /tmp/mancala.sock
+
+Each request is one JSON object per line, each reply one JSON object per line
+carrying the request's "id" (replies to searches can come back out of order):
+
+    {"id": 1, "cmd": "position", "game": "g1", "moves": "CH", "heuristic": "H2"}
+    {"id": 2, "cmd": "search", "game": "g1", "depth": 8}           -> {"id": 2, "ok": true, "move": "D", ...}
+    {"id": 3, "cmd": "search", "game": "g1", "time_ms": 500, "engine": "negamax"}
+    {"id": 4, "cmd": "move", "game": "g1", "pit": "D"}
+    {"id": 5, "cmd": "stop", "game": "g1"}
+    {"id": 6, "cmd": "stats"}                                       (or with "game" for its last search)
+    {"id": 7, "cmd": "quit"}
+
+A position is given as "moves" played from the start (Player 1 first, optional
+"seeds") or as 14 "cells" (A..F, S1, G..L, S2) with "to_move". The side to
+move is the one searched for. Games are private to their connection; searches
+are handed to the first free worker of the pool and queue when all are busy.
+Failed requests get {"ok": false, "error": ...}.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+from book import DEFAULT_BOOK_PATH
+from evalcache import EvalCache
+from mancala import CELL_NAMES, ENGINES, FastMancalaBoard, Game
+from transposition import TranspositionTable
+from worker import SearchWorker
+
+POLL_INTERVAL = 0.002  # seconds between polls of a busy worker
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class _Session:
+    """A game of one connection: the position and the side to move."""
+
+    def __init__(self, board: FastMancalaBoard, to_move: int, heuristic: str):
+        self.board = board
+        self.to_move = to_move
+        self.heuristic = heuristic
+        self.searching = False  # a search is queued or running
+        self.worker = None      # the worker running it, once it has one
+        self.stop_requested = False
+        self.last_stats = None  # statistics of the last finished search
+
+    def stop(self):
+        if self.worker is not None:
+            self.worker.cancel()
+        elif self.searching:
+            self.stop_requested = True  # still waiting for a free worker
+
+
+class EngineServer:
+    """
+    The pool of SearchWorker processes and the protocol. serve_stdio(),
+    serve_tcp() and serve_unix() can run side by side on one pool.
+    """
+
+    def __init__(self, workers: Optional[int] = None, book_path: Optional[str] = None):
+        self.size = workers or os.cpu_count() or 1
+        self.book_path = book_path
+        self._workers = []
+        self._idle: Optional[asyncio.Queue] = None
+        self.started = time.time()
+        self.searches = 0
+        self.search_time = 0.0
+
+    def start(self):
+        """Start the worker processes (they stay warm for the life of the server)."""
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            worker = SearchWorker(play_options={"tt": TranspositionTable(), "eval_cache": EvalCache()},
+                                  book_path=self.book_path)
+            self._workers.append(worker)
+            self._idle.put_nowait(worker)
+
+    def close(self):
+        for worker in self._workers:
+            worker.close()
+        self._workers = []
+
+    # -- transports ---------------------------------------------------------
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        def send(reply: dict):
+            sys.stdout.write(json.dumps(reply) + "\n")
+            sys.stdout.flush()
+
+        await self.handle(reader, send)
+
+    async def serve_tcp(self, host: str, port: int):
+        return await asyncio.start_server(self._connection, host, port)
+
+    async def serve_unix(self, path: str):
+        return await asyncio.start_unix_server(self._connection, path)
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        def send(reply: dict):
+            if not writer.is_closing():
+                writer.write((json.dumps(reply) + "\n").encode())
+
+        try:
+            await self.handle(reader, send)
+        finally:
+            writer.close()
+
+    # -- protocol -----------------------------------------------------------
+
+    async def handle(self, reader: asyncio.StreamReader, send):
+        """Serve one connection until EOF or "quit"; its running searches are cancelled on the way out."""
+        sessions: Dict[str, _Session] = {}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ProtocolError("Request must be a JSON object.")
+                    request_id = request.get("id")
+                    cmd = request.get("cmd")
+                    if cmd == "quit":
+                        send({"id": request_id, "ok": True})
+                        break
+                    if cmd == "search":
+                        session = self._session(sessions, request)
+                        if session.searching:
+                            raise ProtocolError(f"A search is already running for game {request.get('game')!r}.")
+                        if _game_over(session.board):
+                            raise ProtocolError("The game is over.")
+                        # searches run concurrently; their replies are sent when they finish
+                        session.searching, session.stop_requested = True, False
+                        asyncio.ensure_future(self._search(session, request, send))
+                        continue
+                    send(dict(self._command(sessions, cmd, request), id=request_id, ok=True))
+                except (ProtocolError, ValueError) as e:
+                    send({"id": request_id, "ok": False, "error": str(e)})
+                except Exception as e:
+                    # a bug in one request must not take the other games down
+                    send({"id": request_id, "ok": False, "error": f"internal error: {e!r}"})
+        finally:
+            for session in sessions.values():
+                session.stop()
+
+    def _session(self, sessions: Dict[str, _Session], request: dict) -> _Session:
+        name = request.get("game", "default")
+        if name not in sessions:
+            raise ProtocolError(f"Unknown game {name!r}: send a position first.")
+        return sessions[name]
+
+    def _command(self, sessions: Dict[str, _Session], cmd: str, request: dict) -> dict:
+        if cmd == "position":
+            session = _parse_position(request)
+            old = sessions.get(request.get("game", "default"))
+            if old is not None:
+                old.stop()
+            sessions[request.get("game", "default")] = session
+            return _describe(session)
+        if cmd == "move":
+            session = self._session(sessions, request)
+            if session.searching:
+                raise ProtocolError("Cannot move while a search is running; stop it first.")
+            if _game_over(session.board):
+                raise ProtocolError("The game is over.")
+            pit = str(request.get("pit", "")).upper()
+            if pit not in session.board.possibleMoves(session.to_move):
+                raise ProtocolError(f"Illegal move {pit!r} for Player {session.to_move}.")
+            session.board.doMove(session.to_move, pit)
+            _sweep_if_over(session.board)
+            session.to_move = 2 if session.to_move == 1 else 1
+            return _describe(session)
+        if cmd == "stop":
+            self._session(sessions, request).stop()
+            return {}
+        if cmd == "stats":
+            if "game" in request:
+                session = self._session(sessions, request)
+                return {"search": session.last_stats}
+            return {
+                "workers": self.size,
+                "busy": sum(1 for w in self._workers if w.busy),
+                "idle": self._idle.qsize(),
+                "games": len(sessions),
+                "searches": self.searches,
+                "avg_search_ms": round(self.search_time / self.searches * 1000, 3) if self.searches else None,
+                "uptime": round(time.time() - self.started, 3),
+            }
+        raise ProtocolError(f"Unknown command {cmd!r}.")
+
+    async def _search(self, session: _Session, request: dict, send):
+        request_id = request.get("id")
+        try:
+            depth, time_ms, engine = _search_limits(request)
+            result, elapsed, reached, stats = await self._run(session, depth, time_ms, engine)
+        except ProtocolError as e:
+            send({"id": request_id, "ok": False, "error": str(e)})
+            return
+        except Exception as e:
+            send({"id": request_id, "ok": False, "error": f"internal error: {e!r}"})
+            return
+        finally:
+            session.searching = False
+        if result is None:
+            send({"id": request_id, "ok": False, "error": "stopped"})
+            return
+        self.searches += 1
+        self.search_time += elapsed
+        value, pit = result
+        if pit is None:
+            pit = session.board.possibleMoves(session.to_move)[0]
+        session.last_stats = stats
+        send({"id": request_id, "ok": True, "move": pit, "value": value, "depth": reached,
+              "ms": round(elapsed * 1000, 3), "stats": stats})
+
+    async def _run(self, session: _Session, depth: int, time_ms: Optional[float], engine: str):
+        """
+        One search on the first free worker: (value and pit, or None if stopped;
+        seconds; depth reached; search statistics as a dict).
+        """
+        board, side = session.board.copy(), session.to_move
+        if board.side_pits_empty(1) or board.side_pits_empty(2):
+            raise ProtocolError("The game is over.")
+        game = Game(board, human_side=2 if side == 1 else 1, heuristic=session.heuristic)
+        worker = await self._idle.get()
+        if session.stop_requested:
+            self._idle.put_nowait(worker)
+            return None, 0.0, None, None
+        session.worker = worker
+        started = time.perf_counter()
+        worker.start(game, depth, time_ms, engine)
+        result = None
+        try:
+            # a stop (or the connection closing) cancels the job, which ends the wait without a result
+            while True:
+                result = worker.poll()
+                if result is not None or not worker.busy:
+                    break
+                await asyncio.sleep(POLL_INTERVAL)
+        finally:
+            session.worker = None
+            if result is None:
+                worker.cancel()
+            self._idle.put_nowait(worker)
+        stats = worker.last_stats.to_dict() if result is not None and worker.last_stats is not None else None
+        return result, time.perf_counter() - started, worker.last_depth, stats
+
+
+def _parse_position(request: dict) -> _Session:
+    heuristic = request.get("heuristic", "H1")
+    if heuristic not in ("H1", "H2"):
+        raise ProtocolError(f"Unknown heuristic {heuristic!r}, expected H1 or H2.")
+    if "cells" in request:
+        cells = request["cells"]
+        if (not isinstance(cells, list) or len(cells) != len(CELL_NAMES)
+                or not all(isinstance(c, int) and 0 <= c <= 255 for c in cells)):
+            raise ProtocolError("cells must be 14 seed counts (A..F, S1, G..L, S2) between 0 and 255.")
+        to_move = request.get("to_move", 1)
+        if to_move not in (1, 2):
+            raise ProtocolError("to_move must be 1 or 2.")
+        board = FastMancalaBoard.from_cells(list(cells))
+        _sweep_if_over(board)
+        return _Session(board, to_move, heuristic)
+    seeds = request.get("seeds", 4)
+    if not isinstance(seeds, int) or not 1 <= seeds <= 18:
+        raise ProtocolError("seeds must be an integer between 1 and 18.")
+    board = FastMancalaBoard(seeds)
+    side = 1
+    for pit in str(request.get("moves", "")).upper():
+        if _game_over(board):
+            raise ProtocolError(f"Move {pit!r} in moves comes after the end of the game.")
+        if pit not in board.possibleMoves(side):
+            raise ProtocolError(f"Illegal move {pit!r} for Player {side} in moves.")
+        board.doMove(side, pit)
+        _sweep_if_over(board)
+        side = 2 if side == 1 else 1
+    return _Session(board, side, heuristic)
+
+
+def _game_over(board) -> bool:
+    return board.side_pits_empty(1) or board.side_pits_empty(2)
+
+
+def _sweep_if_over(board):
+    """As Game.gameOver(): once a side is empty the other side's seeds go to its owner's store."""
+    if _game_over(board):
+        board.collect_remaining_to_store()
+
+
+def _search_limits(request: dict):
+    depth = request.get("depth", 6)
+    time_ms = request.get("time_ms")
+    engine = request.get("engine", "minimax")
+    if not isinstance(depth, int) or depth < 1:
+        raise ProtocolError("depth must be a positive integer.")
+    if time_ms is not None and (not isinstance(time_ms, (int, float)) or time_ms <= 0):
+        raise ProtocolError("time_ms must be a positive number.")
+    if engine not in ENGINES:
+        raise ProtocolError(f"Unknown engine {engine!r}, expected one of {', '.join(ENGINES)}.")
+    return depth, time_ms, engine
+
+
+def _describe(session: _Session) -> dict:
+    board = session.board
+    over = _game_over(board)
+    return {
+        "cells": list(board.cells),
+        "to_move": session.to_move,
+        "legal": [] if over else board.possibleMoves(session.to_move),
+        "game_over": over,
+    }
+
+
+async def _main(args):
+    book_path = None if args.no_book or not os.path.exists(DEFAULT_BOOK_PATH) else DEFAULT_BOOK_PATH
+    server = EngineServer(args.workers, book_path)
+    server.start()
+    listeners = []
+    try:
+        if args.tcp:
+            host, _, port = args.tcp.rpartition(":")
+            listeners.append(await server.serve_tcp(host or "127.0.0.1", int(port)))
+        if args.unix:
+            listeners.append(await server.serve_unix(args.unix))
+        if listeners:
+            await asyncio.gather(*(listener.serve_forever() for listener in listeners))
+        else:
+            await server.serve_stdio()
+    finally:
+        for listener in listeners:
+            listener.close()
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mancala engine server (JSON lines over stdio, TCP or a Unix socket).")
+    parser.add_argument("--tcp", default=None, help="listen on HOST:PORT instead of stdin/stdout")
+    parser.add_argument("--unix", default=None, help="listen on a Unix socket at this path")
+    parser.add_argument("--workers", type=int, default=None, help="search worker processes (default: all cores)")
+    parser.add_argument("--no-book", action="store_true", help="do not load the opening book")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
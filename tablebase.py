@@ -0,0 +1,176 @@
+"""
+Endgame tablebase: exact values of every position with at most N seeds left in the pits.
+
+    python tablebase.py --max-seeds 10 --out endgame.tb
+
+The value of a position is the best final store difference (side to move minus
+opponent) that the side to move can still force from the seeds left in the pits.
+Stores do not influence the rest of the game, so only the 12 pits and the side
+to move are indexed. Values are stored as one signed byte per position, in the
+order given by position_index(); Tablebase reads them through a memory map.
+"""
+import argparse
+import mmap
+import struct
+import time
+from math import comb
+from typing import Iterator, Optional, Sequence, Tuple
+
+from mancala import FastMancalaBoard, PIT_INDICES, STORE_INDEX
+
+MAGIC = b"MTB1"
+HEADER = struct.Struct("<4sBH")  # magic, version, max seeds
+VERSION = 1
+PITS = PIT_INDICES[1] + PIT_INDICES[2]  # the 12 pit cells, in file order
+_PIT_NAMES = {i: name for i, name in zip(PITS, "ABCDEFGHIJKL")}
+# BINOMIAL[n][k] for the combinatorial ranking below
+_MAX_N = 160
+BINOMIAL = [[comb(n, k) for k in range(13)] for n in range(_MAX_N)]
+
+
+def positions_below(seeds: int) -> int:
+    """Number of 12-pit distributions holding fewer than `seeds` seeds."""
+    return comb(seeds + 11, 12)
+
+
+def composition_rank(pits: Sequence[int]) -> int:
+    """
+    Rank of a 12-pit distribution among all distributions of the same seed count
+    (stars and bars: the 11 separators form a combination, ranked in colex order).
+    """
+    rank = 0
+    bar = -1
+    for k in range(11):
+        bar += pits[k] + 1
+        rank += BINOMIAL[bar][k + 1]
+    return rank
+
+
+def position_index(pits: Sequence[int], side: int) -> int:
+    n = sum(pits)
+    return 2 * (positions_below(n) + composition_rank(pits)) + (side - 1)
+
+
+def compositions(n: int, parts: int = 12) -> Iterator[Tuple[int, ...]]:
+    if parts == 1:
+        yield (n,)
+        return
+    for first in range(n + 1):
+        for rest in compositions(n - first, parts - 1):
+            yield (first,) + rest
+
+
+def _potential(pits: Sequence[int]) -> int:
+    # a move that neither reaches a store nor captures moves seeds to later pits,
+    # so within one seed count the potential strictly increases along every game
+    return sum(k * c for k, c in enumerate(pits))
+
+
+def build(max_seeds: int, path: str, progress: bool = False):
+    """
+    Retrograde solve of every position with at most max_seeds seeds in the pits.
+    Seed counts are solved from 0 upwards and, within one count, from the highest
+    potential down, so every successor is already known when a position is solved.
+    """
+    total = 2 * positions_below(max_seeds + 1)
+    values = bytearray(total)
+    board = FastMancalaBoard(0)
+    started = time.perf_counter()
+
+    def value_of(pits, side):
+        v = values[position_index(pits, side)]
+        return v - 256 if v > 127 else v
+
+    for n in range(max_seeds + 1):
+        layer = sorted(compositions(n), key=_potential, reverse=True)
+        for pits in layer:
+            cells = [0] * 14
+            for cell, c in zip(PITS, pits):
+                cells[cell] = c
+            for side in (1, 2):
+                other = 2 if side == 1 else 1
+                own = sum(cells[i] for i in PIT_INDICES[side])
+                opp = sum(cells[i] for i in PIT_INDICES[other])
+                if own == 0 or opp == 0:
+                    best = own - opp  # game over: each side collects its own pits
+                else:
+                    best = -128
+                    board.cells = cells
+                    for i in PIT_INDICES[side]:
+                        if cells[i] == 0:
+                            continue
+                        before = cells[STORE_INDEX[side]]
+                        undo = board.doMove(side, _PIT_NAMES[i])
+                        gain = cells[STORE_INDEX[side]] - before
+                        own_after = sum(cells[j] for j in PIT_INDICES[side])
+                        opp_after = sum(cells[j] for j in PIT_INDICES[other])
+                        if own_after == 0 or opp_after == 0:
+                            v = gain + own_after - opp_after
+                        else:
+                            v = gain - value_of([cells[j] for j in PITS], other)
+                        board.undoMove(undo)
+                        if v > best:
+                            best = v
+                values[position_index(pits, side)] = best & 0xFF
+        if progress:
+            print(f"  {n:>3} seeds: {len(layer):>8} distributions solved ({time.perf_counter() - started:.1f}s)")
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, max_seeds))
+        f.write(values)
+
+
+class Tablebase:
+    """Memory-mapped, read-only access to a file written by build()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, max_seeds = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a Mancala tablebase (version {VERSION}).")
+        self.max_seeds = max_seeds
+        self.hits = 0
+
+    def probe(self, cells: Sequence[int], side: int) -> Optional[int]:
+        """
+        Exact value for side to move of a position given as 14 cells (FastMancalaBoard
+        layout), or None when more than max_seeds seeds are left in the pits.
+        """
+        pits = [cells[i] for i in PITS]
+        if sum(pits) > self.max_seeds:
+            return None
+        self.hits += 1
+        v = self._map[HEADER.size + position_index(pits, side)]
+        return v - 256 if v > 127 else v
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a Mancala endgame tablebase.")
+    parser.add_argument("--max-seeds", type=int, default=8, help="largest number of seeds left in the pits")
+    parser.add_argument("--out", default="endgame.tb")
+    args = parser.parse_args()
+    if not 0 <= args.max_seeds <= 127:
+        parser.error("--max-seeds must be between 0 and 127")
+    print(f"Building tablebase up to {args.max_seeds} seeds -> {args.out}")
+    started = time.perf_counter()
+    build(args.max_seeds, args.out, progress=True)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Headless self-play tournaments between search configurations.
+
+    python tournament.py --players H1:4 H2:4 H2:6 --games 2000 --openings 2 --out results.csv
+    python tournament.py --players H1:6 H2:6 MCTS:2000 MCTS:8000 --games 400
+
+Every ordered pair of players meets on both sides, each pairing starting
+from the same random opening; games run without printing or sleeping across
+all cores and every finished game is appended to the results file at once.
+Players are alpha-beta searches (HEURISTIC:DEPTH) or Monte Carlo tree searches
+(MCTS:ITERATIONS per move). The CPU time each side used is recorded too, so
+strength can be compared per CPU-second.
+"""
+import argparse
+import csv
+import itertools
+import math
+import multiprocessing
+import os
+import random
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from mancala import FastMancalaBoard, Game, Play
+from mcts import MCTS
+
+# one engine per worker process; no transposition table, so results do not
+# depend on which games a worker happened to play before
+_engine = None
+
+
+def parse_player(spec: str) -> Tuple[str, int]:
+    """'H2:6' -> ('H2', 6); 'MCTS:5000' -> ('MCTS', 5000) iterations per move"""
+    heuristic, _, depth = spec.partition(":")
+    heuristic = heuristic.upper()
+    if heuristic not in ("H1", "H2", "MCTS"):
+        raise argparse.ArgumentTypeError(f"Unknown player in {spec!r}, expected H1, H2 or MCTS.")
+    try:
+        depth = int(depth) if depth else 6 if heuristic != "MCTS" else 10000
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Bad depth in {spec!r}.")
+    if depth < 1:
+        raise argparse.ArgumentTypeError(f"Depth must be >= 1 in {spec!r}.")
+    return heuristic, depth
+
+
+def player_label(player: Tuple[str, int]) -> str:
+    return f"{player[0]}:{player[1]}"
+
+
+def random_opening(rng: random.Random, plies: int, seeds_per_pit: int) -> str:
+    """A random sequence of legal moves (as pit letters) from the start position."""
+    board = FastMancalaBoard(seeds_per_pit)
+    moves = []
+    side = 1
+    for _ in range(plies):
+        legal = board.possibleMoves(side)
+        if not legal or board.side_pits_empty(1) or board.side_pits_empty(2):
+            break
+        pit = rng.choice(legal)
+        board.doMove(side, pit)
+        moves.append(pit)
+        side = 2 if side == 1 else 1
+    return "".join(moves)
+
+
+def play_game(job) -> tuple:
+    """
+    Play one game without output. job = (game_id, p1, p2, opening, seeds_per_pit);
+    returns (game_id, p1 label, p2 label, opening, store1, store2, plies, seconds,
+    CPU seconds of side 1, CPU seconds of side 2).
+    """
+    global _engine
+    if _engine is None:
+        _engine = Play()
+    game_id, p1, p2, opening, seeds_per_pit = job
+    started = time.perf_counter()
+    board = FastMancalaBoard(seeds_per_pit)
+    game = Game(board)
+    side = 1
+    plies = 0
+    cpu = [0.0, 0.0, 0.0]
+    # a fresh tree per MCTS player and game (reused between its moves), seeded by the game id
+    trees = {s: MCTS(iterations=p[1], seed=game_id * 2 + s) for s, p in ((1, p1), (2, p2)) if p[0] == "MCTS"}
+    for pit in opening:
+        board.doMove(side, pit)
+        side = 2 if side == 1 else 1
+        plies += 1
+
+    while not game.gameOver():
+        heuristic, depth = p1 if side == 1 else p2
+        other_side = 2 if side == 1 else 1
+        search_game = Game(board.copy(), human_side=other_side, heuristic=heuristic if heuristic != "MCTS" else "H1")
+        _engine.engine = "mcts" if side in trees else "minimax"
+        _engine.mcts = trees.get(side)
+        cpu_started = time.process_time()
+        _, pit = _engine.chooseMove(search_game, depth)
+        cpu[side] += time.process_time() - cpu_started
+        if pit is None:
+            pit = board.possibleMoves(side)[0]
+        board.doMove(side, pit)
+        side = other_side
+        plies += 1
+
+    return (game_id, player_label(p1), player_label(p2), opening,
+            board.get_score(1), board.get_score(2), plies, round(time.perf_counter() - started, 4),
+            round(cpu[1], 4), round(cpu[2], 4))
+
+
+def schedule(players: List[Tuple[str, int]], games: int, opening_plies: int,
+             seeds_per_pit: int, seed: int) -> Iterator[tuple]:
+    """
+    Yield game jobs round-robin over all ordered player pairs.
+    Both colour assignments of a pair share the same random opening.
+    """
+    rng = random.Random(seed)
+    pairs = list(itertools.combinations(range(len(players)), 2)) or [(0, 0)]
+    game_id = 0
+    while True:
+        for a, b in pairs:
+            opening = random_opening(rng, opening_plies, seeds_per_pit)
+            for p1, p2 in ((a, b), (b, a)):
+                if game_id >= games:
+                    return
+                yield (game_id, players[p1], players[p2], opening, seeds_per_pit)
+                game_id += 1
+
+
+def wilson_interval(successes: int, n: int, z: float = 1.96) -> Tuple[float, float]:
+    """95% Wilson score interval for a proportion."""
+    if n == 0:
+        return 0.0, 0.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def summarize(results: Dict[Tuple[str, str], List[int]]) -> List[str]:
+    """results[(a, b)] = [wins of a, draws, losses of a] -> report lines."""
+    lines = []
+    for (a, b), (w, d, l) in sorted(results.items()):
+        n = w + d + l
+        parts = []
+        for name, count in (("win", w), ("draw", d), ("loss", l)):
+            lo, hi = wilson_interval(count, n)
+            parts.append(f"{name} {count / n:6.1%} [{lo:.1%}, {hi:.1%}]")
+        lines.append(f"{a:>9} vs {b:<9} n={n:<6} " + "  ".join(parts))
+    return lines
+
+
+def summarize_cpu(cpu: Dict[str, List[float]]) -> List[str]:
+    """cpu[label] = [CPU seconds, moves searched] -> one line per player."""
+    return [f"{label:>9} {seconds / moves * 1000:8.1f} ms CPU per move ({seconds:.1f}s over {moves} moves)"
+            for label, (seconds, moves) in sorted(cpu.items()) if moves]
+
+
+def run_tournament(players: List[Tuple[str, int]], games: int, out_path: str, opening_plies: int = 2,
+                   seeds_per_pit: int = 4, workers: Optional[int] = None, seed: int = 0) -> List[str]:
+    labels = [player_label(p) for p in players]
+    # tally per unordered pair, always from the first listed player's point of view
+    tally = {}
+    for i, j in itertools.combinations(range(len(players)), 2):
+        tally[(labels[i], labels[j])] = [0, 0, 0]
+    if not tally:
+        tally[(labels[0], labels[0])] = [0, 0, 0]
+    cpu = {label: [0.0, 0] for label in labels}
+
+    jobs = schedule(players, games, opening_plies, seeds_per_pit, seed)
+    started = time.perf_counter()
+    finished = 0
+    with open(out_path, "w", newline="") as f, multiprocessing.Pool(workers or os.cpu_count()) as pool:
+        writer = csv.writer(f)
+        writer.writerow(["game", "p1", "p2", "opening", "s1", "s2", "plies", "seconds", "cpu1", "cpu2"])
+        for row in pool.imap_unordered(play_game, jobs, chunksize=4):
+            writer.writerow(row)
+            finished += 1
+            _, p1, p2, opening, s1, s2, plies, _, cpu1, cpu2 = row
+            # moves searched by each side after the opening; side 1 moves first
+            searched = plies - len(opening)
+            first = 1 if len(opening) % 2 == 0 else 2
+            moves1 = (searched + 1) // 2 if first == 1 else searched // 2
+            cpu[p1][0] += cpu1
+            cpu[p1][1] += moves1
+            cpu[p2][0] += cpu2
+            cpu[p2][1] += searched - moves1
+            if (p1, p2) in tally:
+                key, margin = (p1, p2), s1 - s2
+            else:
+                key, margin = (p2, p1), s2 - s1
+            tally[key][0 if margin > 0 else 1 if margin == 0 else 2] += 1
+            if finished % 100 == 0:
+                f.flush()
+    elapsed = time.perf_counter() - started
+
+    lines = summarize({k: v for k, v in tally.items() if sum(v)})
+    lines += summarize_cpu(cpu)
+    lines.append(f"{finished} games in {elapsed:.1f}s ({finished / elapsed if elapsed else 0:.1f} games/s)")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Mancala self-play tournament.")
+    parser.add_argument("--players", nargs="+", type=parse_player, default=[("H1", 6), ("H2", 6)],
+                        help="players as HEURISTIC:DEPTH or MCTS:ITERATIONS, e.g. H1:4 H2:6 MCTS:5000 "
+                             "(default: H1:6 H2:6)")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--openings", type=int, default=2, help="random opening plies before the engines take over")
+    parser.add_argument("--seeds", type=int, default=4, help="seeds per pit")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the openings")
+    parser.add_argument("--out", default="tournament.csv", help="results file (CSV, one row per game)")
+    args = parser.parse_args()
+
+    for line in run_tournament(args.players, args.games, args.out, args.openings, args.seeds, args.workers, args.seed):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import random
+from typing import Iterable, Optional, Tuple
+
+# Zobrist keys: one random 64-bit value per (cell, seed count).
+# Cells follow mancala.CELL_NAMES order (A..F, S1, G..L, S2).
+ZOBRIST_MAX_SEEDS = 255
+
+_rng = random.Random(0x4D616E63616C61)  # fixed seed: keys must be stable across processes and files
+ZOBRIST = tuple(tuple(_rng.getrandbits(64) for _ in range(ZOBRIST_MAX_SEEDS + 1)) for _ in range(14))
+# ZOBRIST_STEP[i][c] flips cell i from c to c + 1 seeds in a single xor
+ZOBRIST_STEP = tuple(tuple(row[c] ^ row[c + 1] for c in range(ZOBRIST_MAX_SEEDS)) for row in ZOBRIST)
+SIDE_KEYS = (0, _rng.getrandbits(64), _rng.getrandbits(64))
+# the stored value depends on whose point of view is maximised and with which heuristic
+PERSPECTIVE_KEYS = (0, _rng.getrandbits(64), _rng.getrandbits(64))
+HEURISTIC_KEYS = {"H1": _rng.getrandbits(64), "H2": _rng.getrandbits(64)}
+
+
+def zobrist_hash(cells: Iterable[int]) -> int:
+    h = 0
+    for i, c in enumerate(cells):
+        h ^= ZOBRIST[i][c]
+    return h
+
+
+def context_key(comp_side: int, heuristic: str) -> int:
+    """Key mixed into every entry so searches for different sides/heuristics never share values."""
+    return PERSPECTIVE_KEYS[comp_side] ^ HEURISTIC_KEYS.get(heuristic, HEURISTIC_KEYS["H1"])
+
+
+# Bound types
+EXACT = 0
+LOWER = 1  # value >= stored (beta cutoff)
+UPPER = 2  # value <= stored (failed low)
+# depth stored for results searched to the end of the game: no deeper search can change them
+SOLVED_DEPTH = 1 << 30
+
+REPLACEMENT_POLICIES = ("always", "depth", "aged")
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results.
+    Each slot holds (key, depth, value, flag, move, generation); size is rounded
+    up to a power of two so memory stays flat no matter how long a session runs.
+
+    Replacement policies:
+    - "always": the newest result always wins the slot
+    - "depth":  keep the deeper entry (a new result for the same key always wins)
+    - "aged":   like "depth", but entries from earlier searches are always replaceable
+    """
+
+    def __init__(self, size: int = 1 << 18, policy: str = "aged"):
+        if policy not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement policy {policy!r}, expected one of {REPLACEMENT_POLICIES}.")
+        slots = 1
+        while slots < size:
+            slots <<= 1
+        self.size = slots
+        self.mask = slots - 1
+        self.policy = policy
+        self.entries = [None] * slots
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.rejected = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def probe(self, key: int) -> Optional[Tuple]:
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, value: float, flag: int, move: Optional[str]):
+        slot = key & self.mask
+        old = self.entries[slot]
+        if old is not None and old[0] != key and self.policy != "always":
+            if self.policy == "depth" and old[1] > depth:
+                self.rejected += 1
+                return
+            if self.policy == "aged" and old[5] == self.generation and old[1] > depth:
+                self.rejected += 1
+                return
+        self.entries[slot] = (key, depth, value, flag, move, self.generation)
+        self.stores += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.hits = self.misses = self.stores = self.rejected = 0
+
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "stores": self.stores,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,123 @@
+import multiprocessing
+import queue
+from typing import Optional, Tuple
+
+from mancala import Game
+from searchstats import SearchStats
+
+
+def _worker_main(requests, results, wanted_job, play_options: dict, book_path: Optional[str],
+                 tablebase_path: Optional[str]):
+    from mancala import Play
+    options = dict(play_options)
+    # counters only: the timers would slow the search down
+    options.setdefault("stats", SearchStats(timers=False))
+    if book_path is not None:
+        from book import OpeningBook
+        options["book"] = OpeningBook(book_path)
+    if tablebase_path is not None:
+        from tablebase import Tablebase
+        options["tablebase"] = Tablebase(tablebase_path)
+    play = Play(**options)
+    while True:
+        job = requests.get()
+        if job is None:
+            break
+        job_id, game, depth, time_budget_ms, engine, ponder = job
+        if wanted_job.value != job_id:
+            continue  # cancelled before it started
+        # abandon the search as soon as the GUI no longer wants this job
+        play.stop_check = lambda: wanted_job.value != job_id
+        play.engine = engine
+        if ponder:
+            # until the next job arrives; its search is then answered from the ponder results
+            play.ponder(game, depth, time_budget_ms)
+            continue
+        value, pit = play.chooseMove(game, depth, time_budget_ms)
+        results.put((job_id, value, pit, play.last_depth, play.stats))
+
+
+class SearchWorker:
+    """
+    Runs Play.chooseMove in a background process so a caller (the Pygame loop)
+    can keep handling events: start() a search, poll() every frame, cancel()
+    when the result is no longer wanted. The engine in the worker stays warm
+    (transposition table, ordering tables) between searches, and ponder()
+    keeps it busy on the human's replies while the human thinks.
+    """
+
+    def __init__(self, play_options: Optional[dict] = None, book_path: Optional[str] = None,
+                 tablebase_path: Optional[str] = None):
+        self._requests = multiprocessing.Queue()
+        self._results = multiprocessing.Queue()
+        # id of the job the caller still wants; -1 when none
+        self._wanted = multiprocessing.Value('q', -1, lock=False)
+        self._next_job = 0
+        self._ponder_job = None
+        self._process = multiprocessing.Process(
+            target=_worker_main,
+            args=(self._requests, self._results, self._wanted, play_options or {}, book_path, tablebase_path),
+            daemon=True,
+        )
+        self._process.start()
+        self.last_depth = None
+        self.last_stats: Optional[SearchStats] = None
+
+    @property
+    def busy(self) -> bool:
+        """True while a search started with start() is running (pondering does not count)."""
+        return self._wanted.value not in (-1, self._ponder_job)
+
+    def start(self, game: Game, depth: int, time_budget_ms: Optional[float] = None, engine: str = "minimax") -> int:
+        """
+        Queue a search of game for its computer side with the given Play engine;
+        any search still running is cancelled.
+        """
+        return self._queue(game, depth, time_budget_ms, engine, False)
+
+    def ponder(self, game: Game, depth: int, time_budget_ms: Optional[float] = None, engine: str = "minimax") -> int:
+        """
+        Search ahead on every reply of the human in game (Play.ponder) until the
+        next start() or cancel(). A start() on a pondered position with the
+        same settings is answered at once (last_stats.pondered is then True).
+        """
+        self._ponder_job = self._queue(game, depth, time_budget_ms, engine, True)
+        return self._ponder_job
+
+    def _queue(self, game: Game, depth: int, time_budget_ms: Optional[float], engine: str, ponder: bool) -> int:
+        job_id = self._next_job
+        self._next_job += 1
+        self._wanted.value = job_id
+        self._requests.put((job_id, game, depth, time_budget_ms, engine, ponder))
+        return job_id
+
+    def poll(self) -> Optional[Tuple[float, Optional[str]]]:
+        """(value, pit) once the current search has finished, else None. Never blocks."""
+        while True:
+            try:
+                job_id, value, pit, depth, stats = self._results.get_nowait()
+            except queue.Empty:
+                return None
+            if job_id == self._wanted.value:
+                self._wanted.value = -1
+                self.last_depth = depth
+                self.last_stats = stats
+                return value, pit
+
+    def cancel(self):
+        """Stop the current search; its result will be discarded."""
+        self._wanted.value = -1
+
+    def close(self):
+        self.cancel()
+        if self._process.is_alive():
+            self._requests.put(None)
+            self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.terminate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()